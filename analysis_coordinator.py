@@ -257,13 +257,9 @@ class AnalysisCoordinator:
         Returns:
             str: 'gemini', 'gpt', 'claude', or None if unknown
         """
-        if model.startswith("gemini"):
-            return "gemini"
-        elif model.startswith("gpt"):
-            return "gpt"
-        elif model.startswith("claude"):
-            return "claude"
-        return None
+        # Imported here so the AI client stack is only loaded once an analysis starts
+        from .genai import get_provider_for_model
+        return get_provider_for_model(model)
 
     def _get_prompt_text_with_context(self, user_input_text):
         """
@@ -423,15 +419,17 @@ class AnalysisCoordinator:
             ai_provider: AI provider name
             model_name: Full model name as shown in the model widget
         """
+        from .json_processor import FeatureRecord
+
         provider_name = ai_provider.upper() if ai_provider else "UNKNOWN"
-        bbox_features_data = [{
-            'label': f"Query extent analyzed by {provider_name}",
-            'object_type': 'query_extent',
-            'probability': None,
-            'result_number': 0,
-            'box_2d': [0, 0, 1000, 1000],  # Full extent in 0-1000 range
-            'reason': ''
-        }]
+        bbox_features_data = [FeatureRecord(
+            label=f"Query extent analyzed by {provider_name}",
+            object_type='query_extent',
+            probability=None,
+            result_number=0,
+            reason='',
+            box_2d=(0, 0, 1000, 1000)  # Full extent in 0-1000 range
+        )]
         # Unpack capture state for layer creation (only need extent, width, height)
         extent, _, _, width, height, _ = self.plugin.capture_state.get_all()
         self.plugin.layer_manager.create_single_layer_with_features(
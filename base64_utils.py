@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Base64 utilities for LandTalk.AI plugin
+
+This module provides fast base64 encoding and decoding of image data. pybase64 (SIMD
+accelerated) is used when it is installed in the QGIS Python environment,
+otherwise the standard library base64 module is used.
+"""
+
+try:
+    import pybase64 as _base64
+    # pybase64 releases the GIL while encoding, so images can be encoded on several threads
+    ENCODER_RELEASES_GIL = True
+except ImportError:
+    import base64 as _base64
+    ENCODER_RELEASES_GIL = False
+
+
+def b64encode_str(data):
+    """Base64 encode binary data
+
+    Args:
+        data: Bytes-like object (e.g. bytes or a QByteArray)
+
+    Returns:
+        str: Base64 encoded data
+    """
+    # Base64 output is pure ASCII, which decodes faster than UTF-8
+    return _base64.b64encode(data).decode('ascii')
+
+
+def b64decode(data):
+    """Decode base64 encoded data
+
+    Args:
+        data: Base64 encoded str or bytes
+
+    Returns:
+        bytes: Decoded binary data
+    """
+    return _base64.b64decode(data)
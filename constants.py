@@ -30,16 +30,33 @@ class PluginConstants:
 
     # Timeouts
     API_TIMEOUT = 120  # seconds
+    INTERRUPT_POLL_INTERVAL = 0.1  # seconds between interrupt checks while waiting for the API
+    INTERRUPT_WAIT_MS = 500  # milliseconds to wait for an interrupted AI worker before terminating it
+
+    # HTTP connection pool
+    HTTP_POOL_CONNECTIONS = 3  # hosts kept in the pool (Gemini, OpenAI, Anthropic)
+    HTTP_POOL_MAXSIZE = 8  # keep-alive connections per host
+
+    # Number of successful AI results kept for identical repeat requests (0 disables the cache).
+    # Off by default: re-running a prompt is usually meant to get a fresh answer.
+    AI_RESULT_CACHE_SIZE = 0
 
     # Ground resolution
     DEFAULT_GROUND_RESOLUTION_M_PER_PX = 1.0  # meters per pixel
 
+    # Smallest accepted map selection (screen pixels per side); smaller drags are treated as clicks
+    MIN_SELECTION_SIZE_PX = 2
+
     # Detection coordinate range
     DETECTION_COORD_RANGE = [0, 0, 1000, 1000]  # Full extent in normalized coordinates
 
     # Dock widget names to tabify with
     DOCK_WIDGET_NAMES = ["Information", "Browser", "ProcessingToolbox", "LogMessagePanel"]
 
+    # Logging
+    DEBUG_LOGGING = False  # Also log debug messages (per-item details, request contents, full AI JSON)
+    DEBUG_RENDER = False  # Save the captured image with the AI boxes drawn on it (debug_ai_results.png in the temp directory)
+
     # Default prompt
     DEFAULT_ANALYSIS_PROMPT = "analyze this image"
 
@@ -33,7 +33,6 @@ This module contains the LandTalkDockWidget class for the interactive chat inter
 import os
 import tempfile
 import shutil
-import base64
 from datetime import datetime
 
 from qgis.PyQt.QtWidgets import (
@@ -42,7 +41,7 @@ from qgis.PyQt.QtWidgets import (
     QAction, QSizePolicy, QFileDialog, QMessageBox, QApplication,
     QDialog, QScrollArea, QActionGroup
 )
-from qgis.PyQt.QtCore import Qt, QTimer
+from qgis.PyQt.QtCore import Qt, QTimer, pyqtSlot
 from qgis.PyQt.QtGui import QPixmap, QPainter, QKeySequence
 try:
     from qgis.PyQt.QtWidgets import QShortcut
@@ -56,6 +55,7 @@ from .ui_styles import UIStyles
 from .dimension_utils import calculate_ground_dimensions, format_dimension
 from .constants import PluginConstants
 from .rdf_exporter import RDFExporter
+from .base64_utils import b64encode_str
 
 
 class ImagePopupDialog(QDialog):
@@ -298,7 +298,7 @@ class ExampleImagesDialog(QDialog):
                         # Read and encode the image
                         with open(file_path, 'rb') as image_file:
                             image_data = image_file.read()
-                            base64_data = base64.b64encode(image_data).decode('utf-8')
+                            base64_data = b64encode_str(image_data)
 
                         # Store the image data
                         self.parent_widget.uploaded_images.append((file_path, base64_data))
@@ -1025,6 +1025,7 @@ class LandTalkDockWidget(QDockWidget):
         escape_shortcut = QShortcut(QKeySequence("Escape"), self)
         escape_shortcut.activated.connect(self.interrupt_ai_request)
 
+    @pyqtSlot()
     def on_select_area_clicked(self):
         """Handle the select area button click"""
         if self.parent_plugin:
@@ -1160,6 +1161,7 @@ class LandTalkDockWidget(QDockWidget):
                 "Error",
                 f"Failed to display full-size image: {str(e)}"
             )
+    @pyqtSlot()
     def send_message_to_selected_ai(self):
         """Send message to the currently selected AI model"""
         if not self.parent_plugin:
@@ -1176,6 +1178,7 @@ class LandTalkDockWidget(QDockWidget):
         # Route to the unified AI analysis function
         self.parent_plugin.analyze_with_ai_ui(selected_model)
     
+    @pyqtSlot()
     def interrupt_ai_request(self):
         """Interrupt the current AI request when Escape is pressed"""
         if not self.parent_plugin:
@@ -1194,9 +1197,11 @@ class LandTalkDockWidget(QDockWidget):
         # Clean up the AI worker if it's running
         if hasattr(self.parent_plugin, 'ai_worker') and self.parent_plugin.ai_worker:
             if self.parent_plugin.ai_worker.isRunning():
-                logger.info("Terminating AI worker thread")
-                self.parent_plugin.ai_worker.terminate()
-                self.parent_plugin.ai_worker.wait()
+                # The worker stops waiting for the API as soon as the interrupt flag is seen
+                if not self.parent_plugin.ai_worker.wait(PluginConstants.INTERRUPT_WAIT_MS):
+                    logger.info("Terminating AI worker thread")
+                    self.parent_plugin.ai_worker.terminate()
+                    self.parent_plugin.ai_worker.wait()
                 self.parent_plugin.ai_worker = None
 
         # Add a system message to the chat
@@ -1255,6 +1260,7 @@ class LandTalkDockWidget(QDockWidget):
         """Add a user message to the chat display"""
         self._add_chat_message(message, 'user', 'You')
 
+    @pyqtSlot()
     def show_tutorial(self):
         """Show the tutorial dialog"""
         try:
@@ -1453,6 +1459,7 @@ class LandTalkDockWidget(QDockWidget):
         scrollbar = self.chat_display.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
+    @pyqtSlot()
     def on_model_changed(self):
         """Handle AI model selection change - auto-clear chat if setting is enabled"""
         if hasattr(self, 'parent_plugin') and self.parent_plugin:
@@ -1480,6 +1487,7 @@ class LandTalkDockWidget(QDockWidget):
                     # Also clear the rectangular selection when model changes
                     self.parent_plugin.cleanup_selection()
     
+    @pyqtSlot()
     def save_log_file(self):
         """Open file dialog to save the current log file to a custom location"""
         try:
@@ -1551,6 +1559,7 @@ class LandTalkDockWidget(QDockWidget):
         if len(self.chat_history) > 20:
             self.chat_history = self.chat_history[-20:]
     
+    @pyqtSlot(int)
     def on_resolution_changed(self, index):
         """Handle resolution dropdown change"""
         if not self.parent_plugin:
@@ -1638,6 +1647,7 @@ class LandTalkDockWidget(QDockWidget):
         # Use QTimer to delay the size adjustment until the widget is fully shown
         QTimer.singleShot(100, self.adjust_chat_display_height)
     
+    @pyqtSlot()
     def on_examples_button_clicked(self):
         """Handle examples button click to open the example images dialog"""
         try:
@@ -1649,6 +1659,7 @@ class LandTalkDockWidget(QDockWidget):
             logger.error(f"Error opening example images dialog: {str(e)}")
             QMessageBox.warning(self, "Error", f"Failed to open example images dialog: {str(e)}")
 
+    @pyqtSlot()
     def on_wikidata_button_clicked(self):
         """Handle Wikidata button click to query Wikidata and add results to AI context"""
         logger.info("Wikidata button clicked - starting Wikidata query workflow")
@@ -1687,6 +1698,7 @@ class LandTalkDockWidget(QDockWidget):
             logger.error(f"Error in Wikidata query workflow: {str(e)}")
             QMessageBox.warning(self, "Error", f"Failed to process Wikidata query: {str(e)}")
 
+    @pyqtSlot()
     def on_output_button_clicked(self):
         """Handle Output button click to export analysis results to RDF/Turtle format"""
         logger.info("Output button clicked - starting RDF export")
@@ -1991,6 +2003,7 @@ class LandTalkDockWidget(QDockWidget):
         self.uploaded_images = []
         logger.info("Cleared uploaded images")
 
+    @pyqtSlot()
     def on_persistence_mode_changed(self):
         """Handle layer persistence mode change"""
         if not self.parent_plugin:
@@ -2022,6 +2035,7 @@ class LandTalkDockWidget(QDockWidget):
                     f"{descriptions.get(mode, '')}"
                 )
 
+    @pyqtSlot()
     def on_save_layers_clicked(self):
         """Handle manual save layers button click"""
         if not self.parent_plugin:
@@ -26,18 +26,172 @@
  ***************************************************************************/
 """
 
-import base64
-import threading
+import copy
+import hashlib
 import json
-from .logging import logger
+import threading
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from .logging import logger, DEBUG
 from .simple_network_handler import SimpleNetworkHandler
 from .constants import PluginConstants
+from . import json_utils
+from .base64_utils import b64encode_str, ENCODER_RELEASES_GIL
 
 # Global variable to control full request/response logging
 FULL_REQUEST = False
 
+# AI provider by model name prefix (the part before the first '-')
+_PROVIDER_BY_PREFIX = {"gemini": "gemini", "gpt": "gpt", "claude": "claude"}
+
+# Gemini role of each chat history role that is sent to Gemini
+_GEMINI_ROLES = {"user": "user", "assistant": "model"}
+
+# Data URI prefix of base64 encoded PNG images
+_PNG_DATA_URI_PREFIX = "data:image/png;base64,"
+
+# Maximum number of characters of a message text written to the request log
+_LOG_TEXT_LIMIT = 500
+
+# Characters that matter when matching JSON brackets (all other text is skipped)
+_JSON_STRUCTURE_CHARS = re.compile(r'[{}\[\]"\\]')
+
+# Positions where a JSON object or array may start
+_RE_JSON_OPENER = re.compile(r'[{\[]')
+
+# Decoder used to parse a JSON value at a given position of a longer text
+_JSON_DECODER = json.JSONDecoder()
+
+# Patterns used by GenAIHandler._attempt_json_repair
+_RE_MISSING_VALUE_BEFORE_COMMA = re.compile(r':\s*,')
+_RE_MISSING_VALUE_BEFORE_BRACE = re.compile(r':\s*}')
+_RE_MISSING_VALUE_BEFORE_BRACKET = re.compile(r':\s*\]')
+_RE_TRAILING_COMMA = re.compile(r',(\s*[}\]])')
+_RE_UNQUOTED_KEY = re.compile(r'([{,]\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:')
+
+# Accepted field name variants for detection objects (lowercase, in priority order)
+_LABEL_FIELDS = ('label', 'object_type', 'object type', 'objecttype')
+_BBOX_FIELDS = ('box_2d', 'box2d', 'bounding_box', 'bounding box', 'bbox')
+_POINT_FIELDS = ('point', 'points', 'coordinates')
+
+# Wrapper keys that may hold the list of detection objects (lowercase)
+_CONTAINER_FIELDS = frozenset(('features', 'objects', 'detections'))
+
+def _encode_image_data(image_data, executor=None):
+    """Base64 encode raw image bytes once so every provider receives the same str
+
+    Args:
+        image_data: Single image or list of images, each raw bytes or a base64 str
+        executor: Optional executor used to encode several images concurrently
+
+    Returns:
+        Image data with every bytes-like image replaced by its base64 str
+    """
+    if isinstance(image_data, list):
+        if (executor is not None and ENCODER_RELEASES_GIL and
+                sum(isinstance(img_data, (bytes, bytearray, memoryview)) for img_data in image_data) > 1):
+            return list(executor.map(_encode_image_data, image_data))
+        return [_encode_image_data(img_data) for img_data in image_data]
+    if not isinstance(image_data, (bytes, bytearray, memoryview)):
+        return image_data
+    return b64encode_str(image_data)
+
+
+def _find_json_spans(text):
+    """Find the spans of all bracketed JSON candidates in a single pass
+
+    Brackets are matched by depth, ignoring brackets inside string literals of an
+    open candidate. Nested candidates are reported too, so a valid object inside
+    an invalid outer one can still be found. A candidate left open at the end of
+    the text (e.g. a truncated response) ends at the end of the text.
+
+    Args:
+        text: Text that may contain JSON objects or arrays
+
+    Returns:
+        list: (start, end, is_top_level) tuples ordered by start position
+    """
+    spans = []
+    open_starts = []
+    in_string = False
+    escaped_pos = -1
+    for match in _JSON_STRUCTURE_CHARS.finditer(text):
+        i = match.start()
+        char = text[i]
+        if in_string:
+            if i == escaped_pos:
+                continue
+            if char == '\\':
+                escaped_pos = i + 1
+            elif char == '"':
+                in_string = False
+        elif char in '{[':
+            open_starts.append(i)
+        elif not open_starts:
+            # Quotes and closers in plain text outside a candidate carry no meaning
+            continue
+        elif char in '}]':
+            start = open_starts.pop()
+            spans.append((start, i + 1, not open_starts))
+        elif char == '"':
+            in_string = True
+
+    if open_starts:
+        spans.append((open_starts[0], len(text), True))
+    spans.sort()
+    return spans
+
+
+def _missing_closers(text):
+    """Find the closing brackets needed to close all brackets left open in text
+
+    Brackets inside string literals are ignored, and the closers are returned in
+    nesting order, e.g. '[{"a": [1' needs ']}]'.
+
+    Args:
+        text: Possibly truncated JSON text
+
+    Returns:
+        str: Closing brackets to append (empty if text is balanced)
+    """
+    closers = []
+    in_string = False
+    escaped_pos = -1
+    for match in _JSON_STRUCTURE_CHARS.finditer(text):
+        i = match.start()
+        char = text[i]
+        if in_string:
+            if i == escaped_pos:
+                continue
+            if char == '\\':
+                escaped_pos = i + 1
+            elif char == '"':
+                in_string = False
+        elif char == '{':
+            closers.append('}')
+        elif char == '[':
+            closers.append(']')
+        elif char in '}]':
+            if closers:
+                closers.pop()
+        elif char == '"':
+            in_string = True
+    return ''.join(reversed(closers))
+
+
+def get_provider_for_model(model):
+    """Determine the AI provider ('gemini', 'gpt' or 'claude') from a model name, or None if unknown"""
+    return _PROVIDER_BY_PREFIX.get(model.split("-", 1)[0])
+
+
 class GenAIHandler:
-    """Handler for GenAI API interactions (Gemini, GPT, and Claude)"""
+    """Handler for GenAI API interactions (Gemini, GPT, and Claude)
+
+    The handler owns a network handler with a keep-alive connection pool, so it
+    should be created once and reused for all requests (see
+    LandTalkPlugin.get_genai_handler) rather than reconstructed per call.
+    """
 
     def __init__(self, gemini_api_url, gpt_api_url, claude_api_url, api_timeout):
         """Initialize with reference to the main plugin instance and API configuration"""
@@ -47,13 +201,43 @@ class GenAIHandler:
         self.api_timeout = api_timeout
         self.interrupt_flag = threading.Event()
         self.current_request = None
-        self.network_handler = SimpleNetworkHandler(timeout=PluginConstants.API_TIMEOUT)
+        # Per provider: (source history messages, converted messages) of the last request
+        self._history_cache = {}
+        # Successful results of recent requests in LRU order, keyed by a digest of their inputs
+        self._result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
+        # Request builder and response parser per provider
+        self._provider_handlers = {
+            "gemini": (self._prepare_gemini_request, self._parse_gemini_response),
+            "gpt": (self._prepare_gpt_request, self._parse_gpt_response),
+            "claude": (self._prepare_claude_request, self._parse_claude_response),
+        }
+        self.network_handler = SimpleNetworkHandler(
+            timeout=PluginConstants.API_TIMEOUT,
+            pool_connections=PluginConstants.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=PluginConstants.HTTP_POOL_MAXSIZE
+        )
+        # Blocking HTTP calls run on this pool so the caller can stop waiting on interrupt
+        self.request_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="LandTalkRequest")
+        # Images are encoded on their own pool, so they never queue behind network calls
+        self.encode_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="LandTalkEncode")
+
+    def close(self):
+        """Release the thread pools and the pooled API connections"""
+        self.request_executor.shutdown(wait=False)
+        self.encode_executor.shutdown(wait=False)
+        self.network_handler.close()
 
     def interrupt_request(self):
         """Interrupt the current AI request"""
         logger.info("Request interruption requested by user")
         self.interrupt_flag.set()
-        logger.info("Interrupt flag set - request will be cancelled when checked")
+        if self.current_request is not None:
+            # Close the connection so the upload stops and the provider drops the request
+            self.network_handler.abort_requests()
+            logger.info("Interrupt flag set - request in flight cancelled")
+        else:
+            logger.info("Interrupt flag set - request will be cancelled when checked")
 
     def reset_interrupt(self):
         """Reset the interrupt flag for new requests"""
@@ -66,87 +250,140 @@ class GenAIHandler:
             return {"success": False, "error": "Request interrupted by user", "error_type": "interrupted"}
         return None
 
-    def _get_provider_from_model(self, model):
-        """Determine provider from model name"""
-        if model.startswith("gemini"):
-            return "gemini"
-        elif model.startswith("gpt"):
-            return "gpt"
-        elif model.startswith("claude"):
-            return "claude"
-        return None
+    def _post_interruptible(self, post_method, *args):
+        """Run a blocking network call on the request pool, polling for interruption
+
+        While the call runs it is kept in current_request, so that
+        interrupt_request() can cancel it by closing its connection.
+
+        Returns:
+            dict: The network response, or None if the user interrupted the request.
+        """
+        future = self.request_executor.submit(post_method, *args)
+        self.current_request = future
+        try:
+            while True:
+                try:
+                    network_response = future.result(timeout=PluginConstants.INTERRUPT_POLL_INTERVAL)
+                except FutureTimeoutError:
+                    if self.interrupt_flag.is_set():
+                        return None
+                    continue
+                # A connection error after the interrupt comes from closing the connection
+                return None if self.interrupt_flag.is_set() else network_response
+        finally:
+            self.current_request = None
 
     def _sanitize_payload_for_logging(self, payload, provider):
-        """Create a copy of payload with image data replaced by placeholders for logging"""
-        import copy
-        sanitized = copy.deepcopy(payload)
-        
+        """Create a view of payload with image data replaced by placeholders for logging
+
+        Only the containers leading to image parts are rebuilt; everything else
+        (text parts, generation config, ...) is shared with the original payload.
+        """
+        sanitized = dict(payload)
+
         if provider == "gemini":
             # Remove inline_data from Gemini contents
             if 'contents' in sanitized:
-                for content in sanitized['contents']:
-                    if 'parts' in content:
-                        for part in content['parts']:
-                            if 'inline_data' in part:
-                                part['inline_data'] = {"mime_type": part['inline_data'].get('mime_type', 'image/png'), "data": "<image omitted>"}
+                sanitized['contents'] = [
+                    {**content, 'parts': [
+                        {**part, 'inline_data': {"mime_type": part['inline_data'].get('mime_type', 'image/png'), "data": "<image omitted>"}}
+                        if 'inline_data' in part else part
+                        for part in content['parts']
+                    ]} if 'parts' in content else content
+                    for content in sanitized['contents']
+                ]
         elif provider == "gpt":
             # Remove image URLs from GPT messages
             if 'messages' in sanitized:
-                for message in sanitized['messages']:
-                    if isinstance(message.get('content'), list):
-                        for item in message['content']:
-                            if isinstance(item, dict) and item.get('type') == 'image_url':
-                                if 'image_url' in item and 'url' in item['image_url']:
-                                    item['image_url']['url'] = "<image omitted>"
+                sanitized['messages'] = self._sanitize_message_items(
+                    sanitized['messages'], 'image_url',
+                    lambda item: {**item, 'image_url': {**item['image_url'], 'url': "<image omitted>"}}
+                    if 'url' in item.get('image_url', {}) else item
+                )
         elif provider == "claude":
             # Remove image data from Claude messages
             if 'messages' in sanitized:
-                for message in sanitized['messages']:
-                    if isinstance(message.get('content'), list):
-                        for item in message['content']:
-                            if isinstance(item, dict) and item.get('type') == 'image':
-                                if 'source' in item and 'data' in item['source']:
-                                    item['source']['data'] = "<image omitted>"
-        
+                sanitized['messages'] = self._sanitize_message_items(
+                    sanitized['messages'], 'image',
+                    lambda item: {**item, 'source': {**item['source'], 'data': "<image omitted>"}}
+                    if 'data' in item.get('source', {}) else item
+                )
+
         return sanitized
 
+    @staticmethod
+    def _sanitize_message_items(messages, image_type, sanitize_item):
+        """Rebuild the messages holding image content items of image_type using sanitize_item"""
+        sanitized_messages = []
+        for message in messages:
+            content = message.get('content')
+            if isinstance(content, list):
+                message = {**message, 'content': [
+                    sanitize_item(item) if isinstance(item, dict) and item.get('type') == image_type else item
+                    for item in content
+                ]}
+            sanitized_messages.append(message)
+        return sanitized_messages
+
     def _log_request_messages(self, messages, provider):
         """Log message contents for debugging (consolidated for all providers)"""
-        logger.info(f"=== {provider.upper()} Request Messages ===")
+        # Skip walking the whole chat history when debug messages are discarded anyway
+        if not logger.is_enabled_for(DEBUG):
+            return
+
+        logger.debug(f"=== {provider.upper()} Request Messages ===")
         for i, msg in enumerate(messages):
             if provider == "gemini":
                 role = msg.get('role', 'unknown')
                 parts = msg.get('parts', [])
-                logger.info(f"  Message {i+1} [{role}]:")
+                logger.debug(f"  Message {i+1} [{role}]:")
                 for j, part in enumerate(parts):
-                    if 'text' in part:
-                        logger.info(f"    Part {j+1} [text]: {part['text']}")
-                    elif 'inline_data' in part:
-                        logger.info(f"    Part {j+1} [image]: <image omitted>")
+                    # Check for image parts first so the base64 payload is never formatted
+                    if 'inline_data' in part:
+                        logger.debug(f"    Part {j+1} [image]: <image omitted>")
+                    elif 'text' in part:
+                        logger.debug(f"    Part {j+1} [text]: {self._truncate_for_log(part['text'])}")
+                    else:
+                        logger.debug(f"    Part {j+1} [{', '.join(part)}]: <omitted>")
             else:  # gpt or claude
                 role = msg.get('role', 'unknown')
                 content = msg.get('content', '')
-                logger.info(f"  Message {i+1} [{role}]:")
+                logger.debug(f"  Message {i+1} [{role}]:")
                 if isinstance(content, list):
                     for j, part in enumerate(content):
                         if isinstance(part, dict):
-                            if part.get('type') == 'text':
-                                logger.info(f"    Part {j+1} [text]: {part.get('text', '')}")
-                            elif part.get('type') == 'image_url':
-                                logger.info(f"    Part {j+1} [image]: <image omitted>")
-                            elif part.get('type') == 'image':
-                                logger.info(f"    Part {j+1} [image]: <image omitted>")
+                            part_type = part.get('type')
+                            if part_type in ('image_url', 'image'):
+                                logger.debug(f"    Part {j+1} [image]: <image omitted>")
+                            elif part_type == 'text':
+                                logger.debug(f"    Part {j+1} [text]: {self._truncate_for_log(part.get('text', ''))}")
+                            else:
+                                logger.debug(f"    Part {j+1} [{part_type}]: <omitted>")
                 elif isinstance(content, str):
-                    logger.info(f"    Content: {content}")
-        logger.info(f"=== End {provider.upper()} Request Messages ===")
+                    logger.debug(f"    Content: {self._truncate_for_log(content)}")
+        logger.debug(f"=== End {provider.upper()} Request Messages ===")
+
+    @staticmethod
+    def _truncate_for_log(text):
+        """Shorten text to _LOG_TEXT_LIMIT characters for the request log"""
+        # The precision format spec truncates while formatting, without slicing first
+        return f"{text:.{_LOG_TEXT_LIMIT}}..." if len(text) > _LOG_TEXT_LIMIT else text
 
     def analyze_with_ai(self, prompt_text, chat_context, model, api_key, image_data=None, system_prompt=None):
-        """Unified method to send message to AI API (Gemini or GPT) and return results"""
+        """Unified method to send message to AI API (Gemini or GPT) and return results
+
+        image_data may hold raw PNG bytes or base64 strings; bytes are encoded once
+        here so the request builders only ever receive base64 strings.
+        """
         # Reset interrupt flag for new request
         self.reset_interrupt()
+        # Images as passed in (raw bytes where available) for the result cache key
+        source_image_data = image_data
+        image_data = _encode_image_data(image_data, executor=self.encode_executor)
 
         # Determine provider from model name
-        provider = self._get_provider_from_model(model)
+        provider = get_provider_for_model(model)
         if not provider:
             return {"success": False, "error": f"Unknown model type: {model}", "error_type": "invalid_model"}
 
@@ -166,16 +403,19 @@ class GenAIHandler:
             return {"success": False, "error": f"Please set your {provider_name} API key first.", "error_type": "api_key_required"}
         
         try:
+            # Identical repeat requests (same model, prompts, history and images) reuse the last result
+            cache_key = self._result_cache_key(model, system_prompt, prompt_text, chat_context, source_image_data)
+            cached_result = self._get_cached_result(cache_key)
+            if cached_result:
+                logger.info(f"Returning cached {provider.upper()} result for identical request")
+                return cached_result
+
             logger.info(f"Making API call with provider: {provider} and model: {model}")
             logger.info(f"Chat history length: {len(chat_context) if chat_context else 0}")
 
             # Prepare provider-specific request data
-            if provider == "gemini":
-                headers, url, payload = self._prepare_gemini_request(image_data, prompt_text, chat_context, model, system_prompt, api_key)
-            elif provider == "gpt":
-                headers, url, payload = self._prepare_gpt_request(image_data, prompt_text, chat_context, model, system_prompt, api_key)
-            elif provider == "claude":
-                headers, url, payload = self._prepare_claude_request(image_data, prompt_text, chat_context, model, system_prompt, api_key)
+            prepare_request, parse_response = self._provider_handlers[provider]
+            headers, url, payload = prepare_request(image_data, prompt_text, chat_context, model, system_prompt, api_key)
 
             # Log full request if FULL_REQUEST is enabled
             if FULL_REQUEST:
@@ -183,7 +423,7 @@ class GenAIHandler:
                 logger.info(f"=== FULL {provider.upper()} REQUEST ===")
                 logger.info(f"URL: {url}")
                 logger.info(f"Headers: {headers}")
-                logger.info(f"Payload: {json.dumps(sanitized_payload, indent=2, ensure_ascii=False)}")
+                logger.info(f"Payload: {json_utils.dumps_pretty(sanitized_payload)}")
                 logger.info(f"=== END FULL {provider.upper()} REQUEST ===")
 
             # Check for interruption before making the request
@@ -192,8 +432,11 @@ class GenAIHandler:
                 return interrupt_result
 
             # Make the API request with timeout-based overload handling
+            # Encode the (possibly multi-MB) payload once, straight to the UTF-8 request body
+            body = json_utils.dumps_bytes(payload)
+
             while True:
-                network_response = self.network_handler.post_json(url, headers, payload)
+                network_response = self._post_interruptible(self.network_handler.post_json, url, headers, body)
 
                 # Check for interruption after the request
                 interrupt_result = self._check_interruption()
@@ -227,17 +470,12 @@ class GenAIHandler:
                 # Log full response if FULL_REQUEST is enabled
                 if FULL_REQUEST:
                     logger.info(f"=== FULL {provider.upper()} RESPONSE ===")
-                    logger.info(f"Response: {json.dumps(response_json, indent=2, ensure_ascii=False)}")
+                    logger.info(f"Response: {json_utils.dumps_pretty(response_json)}")
                     logger.info(f"=== END FULL {provider.upper()} RESPONSE ===")
                 break
             
             # Parse provider-specific response
-            if provider == "gemini":
-                response = self._parse_gemini_response(response_json)
-            elif provider == "gpt":
-                response = self._parse_gpt_response(response_json)
-            elif provider == "claude":
-                response = self._parse_claude_response(response_json)
+            response = parse_response(response_json)
             logger.info(f"{provider.upper()} parsed response received")
                 
 
@@ -245,7 +483,10 @@ class GenAIHandler:
                 error_message = response.get('error', {}).get('message', "Unknown error")
                 return {"success": False, "error": f"Error: {error_message}", "error_type": "api_error"}
                 
-            result_text = response.get('candidates', [{}])[0].get('content', {}).get('parts', [{}])[0].get('text', "No response")
+            try:
+                result_text = response['candidates'][0]['content']['parts'][0]['text']
+            except (KeyError, IndexError, TypeError):
+                result_text = "No response"
 
             # Extract JSON from response
             cleaned_text, my_json = self.extract_json_from_response(result_text)
@@ -259,7 +500,7 @@ class GenAIHandler:
                 validation_status = "no_json"
                 logger.info("No valid JSON data found in response after validation")
             
-            return {
+            result = {
                 "success": True,
                 "result_text": result_text,  # Keep original text with JSON for UI formatting
                 "json_data": my_json,
@@ -267,10 +508,59 @@ class GenAIHandler:
                 "provider": provider,
                 "validation_status": validation_status
             }
+            self._store_cached_result(cache_key, result)
+            return result
             
         except Exception as e:
             return {"success": False, "error": f"Error: {str(e)}", "error_type": "exception", "image_data": image_data}
 
+    @staticmethod
+    def _result_cache_key(model, system_prompt, prompt_text, chat_context, image_data):
+        """Build the result cache key as a BLAKE2b digest over all request inputs
+
+        Images are hashed in the form they were passed in, so raw image bytes are
+        hashed directly instead of their larger base64 encoding.
+
+        Returns:
+            bytes: Digest of the inputs, or None if result caching is disabled
+        """
+        if PluginConstants.AI_RESULT_CACHE_SIZE <= 0:
+            return None
+        images = image_data if isinstance(image_data, list) else [image_data] if image_data else []
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json_utils.dumps_bytes([
+            model, system_prompt, prompt_text,
+            [(message.get('role'), message.get('content')) for message in chat_context],
+            len(images)
+        ]))
+        for img_data in images:
+            digest.update(img_data.encode('ascii') if isinstance(img_data, str) else img_data)
+            digest.update(b'\0')
+        return digest.digest()
+
+    def _get_cached_result(self, cache_key):
+        """Return a deep copy of the cached result for cache_key, or None if there is none"""
+        if cache_key is None:
+            return None
+        with self._result_cache_lock:
+            result = self._result_cache.get(cache_key)
+            if result is None:
+                return None
+            self._result_cache.move_to_end(cache_key)
+        # Callers may modify the result (e.g. its json_data), so the entry is never handed out
+        return copy.deepcopy(result)
+
+    def _store_cached_result(self, cache_key, result):
+        """Cache a copy of a successful result, evicting the least recently used one when full"""
+        if cache_key is None:
+            return
+        result = copy.deepcopy(result)
+        with self._result_cache_lock:
+            self._result_cache[cache_key] = result
+            self._result_cache.move_to_end(cache_key)
+            while len(self._result_cache) > PluginConstants.AI_RESULT_CACHE_SIZE:
+                self._result_cache.popitem(last=False)
+
     def _prepare_gemini_request(self, image_data, prompt_text, chat_history=None, model=None, system_prompt=None, api_key=None):
         """Prepare Gemini-specific request headers, URL, and payload"""
         logger.info(f"Preparing Gemini request - model: {model}, has_image: {bool(image_data)}")
@@ -302,14 +592,7 @@ class GenAIHandler:
 
         # 2. Add chat history (convert roles for Gemini format)
         if chat_history:
-            for msg in chat_history:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                if role == 'user':
-                    contents.append({"role": "user", "parts": [{"text": content}]})
-                elif role == 'assistant':
-                    contents.append({"role": "model", "parts": [{"text": content}]})
-                # Skip system messages in history as they're handled separately
+            contents.extend(self._convert_chat_history("gemini", chat_history, self._to_gemini_message))
 
         # 3. New user message comes last (with system prompt prepended if available)
         user_message_text = f"{system_prompt}\n{prompt_text}" if system_prompt else prompt_text
@@ -371,13 +654,8 @@ class GenAIHandler:
             images_list = image_data if isinstance(image_data, list) else [image_data]
 
             for img_data in images_list:
-                # Base64 encode the image if it's not already encoded
-                if isinstance(img_data, bytes) or not img_data.startswith("data:"):
-                    encoded_image = base64.b64encode(img_data).decode('utf-8') if isinstance(img_data, bytes) else img_data
-                    image_url = f"data:image/png;base64,{encoded_image}"
-                else:
-                    image_url = img_data
-
+                # Images arrive base64 encoded, only the data URI prefix may be missing
+                image_url = img_data if img_data.startswith("data:") else _PNG_DATA_URI_PREFIX + img_data
                 messages.append({
                     "role": "user",
                     "content": [{"type": "image_url", "image_url": {"url": image_url}}]
@@ -385,12 +663,7 @@ class GenAIHandler:
 
         # 3. Add chat history
         if chat_history:
-            for msg in chat_history:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                # Only add text content for history messages (no images)
-                if role in ['user', 'assistant', 'system']:
-                    messages.append({"role": role, "content": content})
+            messages.extend(self._convert_chat_history("gpt", chat_history, self._to_gpt_message))
 
         # 4. New user message comes last
         messages.append({"role": "user", "content": prompt_text})
@@ -426,15 +699,11 @@ class GenAIHandler:
             images_list = image_data if isinstance(image_data, list) else [image_data]
 
             for img_data in images_list:
-                # Base64 encode the image if it's not already encoded
-                if isinstance(img_data, bytes) or not img_data.startswith("data:"):
-                    encoded_image = base64.b64encode(img_data).decode('utf-8') if isinstance(img_data, bytes) else img_data
+                # Images arrive base64 encoded, remove the data URI prefix if present
+                if img_data.startswith(_PNG_DATA_URI_PREFIX):
+                    encoded_image = img_data[len(_PNG_DATA_URI_PREFIX):]
                 else:
-                    # Remove data URI prefix if present
-                    if img_data.startswith("data:image/png;base64,"):
-                        encoded_image = img_data.replace("data:image/png;base64,", "")
-                    else:
-                        encoded_image = img_data
+                    encoded_image = img_data
 
                 messages.append({
                     "role": "user",
@@ -452,16 +721,7 @@ class GenAIHandler:
 
         # 2. Add chat history
         if chat_history:
-            for msg in chat_history:
-                role = msg.get('role', 'user')
-                content = msg.get('content', '')
-                # Convert 'assistant' to 'assistant', 'user' stays 'user'
-                if role == 'assistant':
-                    role = 'assistant'
-                else:
-                    role = 'user'
-                # Only add text content for history messages (no images)
-                messages.append({"role": role, "content": content})
+            messages.extend(self._convert_chat_history("claude", chat_history, self._to_claude_message))
 
         # 3. New user message comes last (with system prompt prepended if available)
         user_message_text = f"{system_prompt}\n{prompt_text}" if system_prompt else prompt_text
@@ -483,6 +743,66 @@ class GenAIHandler:
 
         return headers, self.claude_api_url, payload
 
+    def _convert_chat_history(self, provider, chat_history, convert_message):
+        """Convert chat history messages to provider format, reusing earlier conversions
+
+        Each turn passes the previous history plus new messages (with the oldest
+        ones dropped once the history is full), so only messages that were not
+        part of the previous request for this provider are converted. Messages
+        are matched by identity, which is safe because the cache keeps them alive.
+
+        Args:
+            provider: Provider name used as cache key
+            chat_history: List of {'role', 'content'} message dicts
+            convert_message: Function returning the provider message or None to skip it
+
+        Returns:
+            list: Converted messages in history order
+        """
+        if not chat_history:
+            return []
+
+        cached_sources, cached_converted = self._history_cache.get(provider, ((), ()))
+
+        converted = []
+        for offset, source in enumerate(cached_sources):
+            if source is chat_history[0]:
+                overlap = cached_sources[offset:]
+                if len(overlap) <= len(chat_history) and all(a is b for a, b in zip(overlap, chat_history)):
+                    converted = list(cached_converted[offset:])
+                break
+
+        converted.extend(map(convert_message, chat_history[len(converted):]))
+
+        self._history_cache[provider] = (tuple(chat_history), tuple(converted))
+        return [msg for msg in converted if msg is not None]
+
+    @staticmethod
+    def _to_gemini_message(msg):
+        """Convert a chat history message to Gemini format"""
+        # Skip system messages in history as they're handled separately
+        role = _GEMINI_ROLES.get(msg.get('role', 'user'))
+        if role is None:
+            return None
+        return {"role": role, "parts": [{"text": msg.get('content', '')}]}
+
+    @staticmethod
+    def _to_gpt_message(msg):
+        """Convert a chat history message to GPT format"""
+        role = msg.get('role', 'user')
+        # Only add text content for history messages (no images)
+        if role in ('user', 'assistant', 'system'):
+            return {"role": role, "content": msg.get('content', '')}
+        return None
+
+    @staticmethod
+    def _to_claude_message(msg):
+        """Convert a chat history message to Claude format"""
+        # Claude only knows 'user' and 'assistant' roles in messages
+        role = 'assistant' if msg.get('role', 'user') == 'assistant' else 'user'
+        # Only add text content for history messages (no images)
+        return {"role": role, "content": msg.get('content', '')}
+
     def _parse_gemini_response(self, response_json):
         """Parse Gemini API response (already in correct format)"""
         return response_json
@@ -506,11 +826,9 @@ class GenAIHandler:
         # Extract the text from Claude response and normalize to Gemini format
         if 'content' in response_json and len(response_json['content']) > 0:
             # Claude returns content as a list of blocks
-            result_text = ""
-            for block in response_json['content']:
-                if block.get('type') == 'text':
-                    result_text += block.get('text', '')
-            
+            result_text = "".join(block.get('text', '') for block in response_json['content']
+                                  if block.get('type') == 'text')
+
             return {
                 "candidates": [{
                     "content": {
@@ -522,49 +840,143 @@ class GenAIHandler:
 
     def extract_json_from_response(self, response_text):
         """Extract first valid JSON string from AI response text and return cleaned text and validated JSON data"""
-        import json
-        import re
-
         if not response_text or not isinstance(response_text, str):
             return response_text, None
 
         logger.info("Extracting JSON from response")
 
-        # Use json.loads to find valid JSON by testing different string boundaries
-        # Start from each opening brace/bracket and try to find the complete JSON
-        for i, char in enumerate(response_text):
-            if char in '{[':
-                # Try to find the complete JSON starting from this position
-                for end_pos in range(i + 1, len(response_text) + 1):
+        # Fast path: models usually wrap the JSON in a fenced code block
+        fenced_result = self._extract_fenced_json(response_text)
+        if fenced_result:
+            logger.info("Successfully extracted and validated JSON from code block")
+            return fenced_result
+
+        # Parse each bracket-matched candidate once, in order of its start position.
+        # The span is known up front, so the fast json_utils parser can be used.
+        spans = _find_json_spans(response_text)
+        last_top_level_start = max((start for start, _, is_top_level in spans if is_top_level), default=-1)
+        span_result = None
+        span_result_start = len(response_text)
+        for i, span_end, is_top_level in spans:
+            try:
+                parsed_json = json_utils.loads(response_text[i:span_end])
+            except json_utils.JSONDecodeError:
+                # Only the final top-level candidate is worth repairing (e.g. a truncated response)
+                if i != last_top_level_start:
+                    continue
+                repaired_json = self._attempt_json_repair(response_text[i:span_end])
+                if repaired_json:
                     try:
-                        json_candidate = response_text[i:end_pos]
-                        parsed_json = json.loads(json_candidate)
-
-                        # Use basic validation
+                        parsed_json = json_utils.loads(repaired_json)
                         if self._basic_json_validation(parsed_json):
-                            # Remove the JSON from the response text and clean up whitespace
-                            cleaned_text = (response_text[:i] + response_text[end_pos:].strip()).replace('\n\n\n', '\n\n').strip()
-                            logger.info("Successfully extracted and validated JSON")
-                            return cleaned_text, parsed_json
-                    except json.JSONDecodeError as e:
-                        # Try to repair common JSON issues before giving up on this position
-                        if end_pos == len(response_text):
-                            json_candidate = response_text[i:end_pos]
-                            repaired_json = self._attempt_json_repair(json_candidate)
-                            if repaired_json:
-                                try:
-                                    parsed_json = json.loads(repaired_json)
-                                    if self._basic_json_validation(parsed_json):
-                                        cleaned_text = (response_text[:i] + response_text[end_pos:].strip()).replace('\n\n\n', '\n\n').strip()
-                                        logger.info("Successfully extracted and validated JSON after repair")
-                                        return cleaned_text, parsed_json
-                                except json.JSONDecodeError:
-                                    pass
-                        continue
+                            cleaned_text = (response_text[:i] + response_text[span_end:].strip()).replace('\n\n\n', '\n\n').strip()
+                            span_result, span_result_start = (cleaned_text, parsed_json), i
+                            break
+                    except json_utils.JSONDecodeError:
+                        pass
+                continue
+
+            # Use basic validation
+            if self._basic_json_validation(parsed_json):
+                # Remove the JSON from the response text and clean up whitespace
+                cleaned_text = (response_text[:i] + response_text[span_end:].strip()).replace('\n\n\n', '\n\n').strip()
+                span_result, span_result_start = (cleaned_text, parsed_json), i
+                break
+
+        # Bracket matching can be misled by prose, e.g. an unclosed '{' followed by an
+        # inch sign makes it read the real JSON as string content. Every opening bracket
+        # before the candidate found (or in the whole text if none was found) is decoded
+        # in turn. If a candidate was found, the matched span starts were already parsed,
+        # so only the few openers the matching did not see are left to try.
+        skipped_starts = {start for start, _, _ in spans} if span_result else ()
+        scanned_result = self._extract_json_at_each_start(response_text, span_result_start, skipped_starts)
+        if scanned_result:
+            return scanned_result
+        if span_result:
+            logger.info("Successfully extracted and validated JSON")
+            return span_result
 
         logger.info("No valid JSON data found in response")
         return response_text, None
 
+    def _extract_json_at_each_start(self, response_text, end, skipped_starts=()):
+        """Try to decode (or repair) JSON at each opening bracket, in text order
+
+        Slower than parsing the bracket-matched candidates, but not misled by quotes
+        or brackets in the surrounding prose.
+
+        Args:
+            response_text: AI response text
+            end: Position before which a JSON value must start
+            skipped_starts: Start positions that were already tried
+
+        Returns:
+            tuple: (cleaned_text, json_data) or None if no valid JSON was found
+        """
+        for match in _RE_JSON_OPENER.finditer(response_text, 0, end):
+            i = match.start()
+            if i in skipped_starts:
+                continue
+            try:
+                parsed_json, end_pos = _JSON_DECODER.raw_decode(response_text, i)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if self._basic_json_validation(parsed_json):
+                    cleaned_text = (response_text[:i] + response_text[end_pos:].strip()).replace('\n\n\n', '\n\n').strip()
+                    logger.info("Successfully extracted and validated JSON")
+                    return cleaned_text, parsed_json
+                # The rest of the text is exactly this value, nothing left to repair
+                if not response_text[end_pos:].strip():
+                    continue
+
+            # Try to repair common JSON issues before giving up on this position
+            repaired_json = self._attempt_json_repair(response_text[i:])
+            if repaired_json:
+                try:
+                    parsed_json = json.loads(repaired_json)
+                except json.JSONDecodeError:
+                    continue
+                if self._basic_json_validation(parsed_json):
+                    cleaned_text = response_text[:i].replace('\n\n\n', '\n\n').strip()
+                    logger.info("Successfully extracted and validated JSON after repair")
+                    return cleaned_text, parsed_json
+        return None
+
+    def _extract_fenced_json(self, response_text):
+        """Try to parse the JSON inside the first ```json (or plain ```) code fence
+
+        Args:
+            response_text: AI response text
+
+        Returns:
+            tuple: (cleaned_text, json_data) or None if no valid fenced JSON was found
+        """
+        fence_start = response_text.find("```json")
+        marker_length = len("```json")
+        if fence_start < 0:
+            fence_start = response_text.find("```")
+            marker_length = len("```")
+            if fence_start < 0:
+                return None
+
+        body_start = fence_start + marker_length
+        fence_end = response_text.find("```", body_start)
+        if fence_end < 0:
+            return None
+
+        try:
+            parsed_json = json_utils.loads(response_text[body_start:fence_end])
+        except json_utils.JSONDecodeError:
+            return None
+
+        if not self._basic_json_validation(parsed_json):
+            return None
+
+        # Remove the whole code block from the response text and clean up whitespace
+        cleaned_text = (response_text[:fence_start] + response_text[fence_end + 3:].strip()).replace('\n\n\n', '\n\n').strip()
+        return cleaned_text, parsed_json
+
     def _attempt_json_repair(self, json_str):
         """Attempt to repair common JSON syntax errors
 
@@ -574,8 +986,6 @@ class GenAIHandler:
         Returns:
             str: Repaired JSON string or None if repair failed
         """
-        import re
-
         if not json_str or not isinstance(json_str, str):
             return None
 
@@ -584,27 +994,24 @@ class GenAIHandler:
         try:
             # Pattern 1: Fix missing values after colons (e.g., "key":, -> "key": null,)
             # This handles cases like {"box_2d":, "label": ...}
-            repaired = re.sub(r':\s*,', ': null,', json_str)
+            repaired = _RE_MISSING_VALUE_BEFORE_COMMA.sub(': null,', json_str)
 
             # Pattern 2: Fix missing values before closing braces (e.g., "key":} -> "key": null})
-            repaired = re.sub(r':\s*}', ': null}', repaired)
+            repaired = _RE_MISSING_VALUE_BEFORE_BRACE.sub(': null}', repaired)
 
             # Pattern 3: Fix missing values before closing brackets (e.g., "key":] -> "key": null])
-            repaired = re.sub(r':\s*\]', ': null]', repaired)
+            repaired = _RE_MISSING_VALUE_BEFORE_BRACKET.sub(': null]', repaired)
 
             # Pattern 4: Fix trailing commas in objects
-            repaired = re.sub(r',(\s*[}\]])', r'\1', repaired)
+            repaired = _RE_TRAILING_COMMA.sub(r'\1', repaired)
 
             # Pattern 5: Fix missing quotes around keys (basic attempt)
             # Match word characters followed by colon, ensure they're quoted
-            repaired = re.sub(r'([{,]\s*)([a-zA-Z_][a-zA-Z0-9_]*)\s*:', r'\1"\2":', repaired)
+            repaired = _RE_UNQUOTED_KEY.sub(r'\1"\2":', repaired)
 
             # Pattern 6: Handle incomplete arrays at the end
             # If string ends with incomplete structure, try to close it
-            if repaired.count('[') > repaired.count(']'):
-                repaired += ']' * (repaired.count('[') - repaired.count(']'))
-            if repaired.count('{') > repaired.count('}'):
-                repaired += '}' * (repaired.count('{') - repaired.count('}'))
+            repaired += _missing_closers(repaired)
 
             if repaired != json_str:
                 logger.info(f"JSON repair attempted. Original: {json_str[:100]}... -> Repaired: {repaired[:100]}...")
@@ -615,82 +1022,73 @@ class GenAIHandler:
 
         return None
     
-    def _has_field_case_insensitive(self, obj, field_variants):
-        """Check if object has any of the field variants (case-insensitive)"""
-        if not isinstance(obj, dict):
-            return False
-        obj_keys_lower = {k.lower(): k for k in obj.keys()}
-        return any(variant.lower() in obj_keys_lower for variant in field_variants)
-
-    def _get_field_value_case_insensitive(self, obj, field_variants):
+    @staticmethod
+    def _get_field_value_case_insensitive(fields_by_lower_key, field_variants):
         """Get value from dict using case-insensitive field lookup
 
         Args:
-            obj: Dictionary to search
-            field_variants: List of field names to try (in order of priority)
+            fields_by_lower_key: Object fields keyed by their lowercased names
+            field_variants: Lowercase field names to try (in order of priority)
 
         Returns:
             Value if found, None otherwise
         """
-        if not isinstance(obj, dict):
-            return None
-        obj_keys_lower = {k.lower(): k for k in obj.keys()}
         for field_name in field_variants:
-            field_lower = field_name.lower()
-            if field_lower in obj_keys_lower:
-                return obj[obj_keys_lower[field_lower]]
+            if field_name in fields_by_lower_key:
+                return fields_by_lower_key[field_name]
         return None
 
     def _validate_feature_object(self, item):
         """Validate a single feature object has required fields with valid values"""
-        # Check for label/object_type
-        label_value = self._get_field_value_case_insensitive(item, ['label', 'object_type', 'object type', 'objectType'])
-        has_valid_label = label_value is not None and label_value != ''
+        # Only require object_type and geometry - confidence and reason are optional.
+        # Each check returns as soon as it fails, so rejected objects are cheap.
 
-        # Check for bbox with valid data (list/array with at least 4 elements)
-        bbox_value = self._get_field_value_case_insensitive(item, ['box_2d', 'box2d', 'bounding_box', 'bounding box', 'bbox'])
-        has_valid_bbox = (bbox_value is not None and
-                         isinstance(bbox_value, (list, tuple)) and
-                         len(bbox_value) >= 4 and
-                         all(v is not None for v in bbox_value[:4]))
-
-        # Check for point with valid data (list/array with at least 2 elements)
-        point_value = self._get_field_value_case_insensitive(item, ['point', 'points', 'coordinates'])
-        has_valid_point = (point_value is not None and
-                          isinstance(point_value, (list, tuple)) and
-                          len(point_value) >= 2 and
-                          all(v is not None for v in point_value[:2]))
-
-        has_valid_geometry = has_valid_bbox or has_valid_point
-
-        # Log validation failure reasons for debugging
-        if not has_valid_label:
+        # Lowercase the keys once for all field lookups of this object
+        fields_by_lower_key = {key.lower(): value for key, value in item.items()}
+
+        # Check for label/object_type
+        label_value = self._get_field_value_case_insensitive(fields_by_lower_key, _LABEL_FIELDS)
+        if label_value is None or label_value == '':
             logger.debug(f"Feature validation failed: missing or empty label (value: {label_value})")
-        if not has_valid_geometry:
-            logger.debug(f"Feature validation failed: invalid geometry (bbox: {bbox_value}, point: {point_value})")
+            return False
 
-        # Only require object_type and geometry - confidence and reason are optional
-        return has_valid_label and has_valid_geometry
+        # Check for bbox with valid data (list/array with at least 4 elements)
+        bbox_value = self._get_field_value_case_insensitive(fields_by_lower_key, _BBOX_FIELDS)
+        if (isinstance(bbox_value, (list, tuple)) and
+                len(bbox_value) >= 4 and
+                all(v is not None for v in bbox_value[:4])):
+            return True
+
+        # Fall back to a point with valid data (list/array with at least 2 elements)
+        point_value = self._get_field_value_case_insensitive(fields_by_lower_key, _POINT_FIELDS)
+        if (isinstance(point_value, (list, tuple)) and
+                len(point_value) >= 2 and
+                all(v is not None for v in point_value[:2])):
+            return True
+
+        logger.debug(f"Feature validation failed: invalid geometry (bbox: {bbox_value}, point: {point_value})")
+        return False
 
     def _basic_json_validation(self, json_data):
         """Basic JSON validation fallback when Pydantic is not available"""
         try:
 
             if isinstance(json_data, list):
-                # Check if it's a list of objects with expected fields
-                if len(json_data) == 0:
+                # Check if it's a list of objects with expected fields, stopping at the first invalid one
+                if not json_data:
                     return False
-                return all(isinstance(item, dict) and self._validate_feature_object(item) for item in json_data)
+                for item in json_data:
+                    if not isinstance(item, dict) or not self._validate_feature_object(item):
+                        return False
+                return True
             elif isinstance(json_data, dict):
                 # Check if it's a wrapper object containing features
-                if self._has_field_case_insensitive(json_data, ['features', 'objects', 'detections']):
-                    for key in json_data.keys():
-                        if key.lower() in ['features', 'objects', 'detections']:
-                            nested_items = json_data[key]
-                            return isinstance(nested_items, list) and self._basic_json_validation(nested_items)
-                else:
-                    # It's a single object, validate it
-                    return self._validate_feature_object(json_data)
+                for key in json_data:
+                    if key.lower() in _CONTAINER_FIELDS:
+                        nested_items = json_data[key]
+                        return isinstance(nested_items, list) and self._basic_json_validation(nested_items)
+                # It's a single object, validate it
+                return self._validate_feature_object(json_data)
             return False
         except Exception as e:
             logger.warning(f"Basic validation error: {e}")
@@ -4,8 +4,23 @@ Tutorial Dialog Text Resources
 
 This module contains all the text content for the tutorial dialog,
 separated from the UI code for better maintainability and potential localization.
+The HTML content of the tabs lives in the tutorial_*.html files next to this
+module and is only read when a tab is first shown.
 """
 
+import os
+import re
+from functools import lru_cache
+
+# tutorial_dialog star-imports this module, so only the texts and the loader are exported
+__all__ = [
+    'WINDOW_TITLE', 'WELCOME_TITLE', 'WELCOME_SUBTITLE', 'WELCOME_DESCRIPTION',
+    'TAB_GETTING_STARTED', 'TAB_TIPS_TRICKS', 'TAB_FAQ',
+    'GETTING_STARTED_CONTENT_FILE', 'TIPS_TRICKS_CONTENT_FILE', 'FAQ_CONTENT_FILE',
+    'DONT_SHOW_AGAIN_TEXT', 'CLOSE_BUTTON_TEXT',
+    'load_tutorial_content',
+]
+
 # Window and Header Texts
 WINDOW_TITLE = "Welcome to LandTalk.AI"
 WELCOME_TITLE = "Welcome to LandTalk.AI"
@@ -20,89 +35,33 @@ TAB_GETTING_STARTED = "Getting Started"
 TAB_TIPS_TRICKS = "Tips and Tricks"
 TAB_FAQ = "FAQ"
 
-# Getting Started Tab Content
-GETTING_STARTED_CONTENT = """
-<h2>Step 1: Set Up Your API Keys</h2>
-<p>Before you can use LandTalk.AI, you need to register with at least one AI provider and get an API key:</p>
-<ul>
-    <li><b>Google Gemini &amp; Gemma:</b> Visit <a href='https://aistudio.google.com/apikey'>Google AI Studio</a> to get your free API key. This key covers both Gemini and Gemma models.</li>
-    <li><b>OpenAI GPT:</b> Visit <a href='https://platform.openai.com/api-keys'>OpenAI Platform</a> to get your API key.</li>
-    <li><b>Anthropic Claude:</b> Visit <a href='https://console.anthropic.com'>Anthropic Console</a> to get your API key.</li>
-</ul>
-<p>Once you have your keys, click the <b>Options</b> button in the LandTalk.AI panel and select the appropriate key option to enter it. You can register with multiple providers and switch between them at any time.</p>
-
-<h2>Step 2: Basic Workflow</h2>
-<p>The basic workflow for using LandTalk.AI is simple:</p>
-<ol>
-    <li><b>Adapt for your domain of interest:</b> Click on the 'Rules' button at the bottom and choose your field of interest in the dropdown menu. In case your domain is not listed, go to "Custom" and fill in your data.</li>
-    <li><b>Select an area:</b> Click 'Select area' and draw a rectangle on your map</li>
-    <li><b>Analyze:</b> Click 'Analyze' to send your request to the AI</li>
-    <li><b>View results:</b> The AI will create map layers in a new group called 'LandTalk.ai' showing detected features</li>
-</ol>
-
-<h2>Step 3: Optional Enhancements</h2>
-<p>To get more detailed and customized analysis:</p>
-<ul>
-    <li><b>Add a message:</b> Explain in more detail what you want to analyze in the text box. For example "Search for mural features"</li>
-    <li><b>Choose AI model:</b> Select from Gemini, Gemma, GPT, or Claude models in the dropdown. Different models may give different results.</li>
-</ul>
-
-<h2>Step 4: Understanding Results</h2>
-<p>When the AI analyzes your map area, it will:</p>
-<ul>
-    <li><b>Create map layers:</b> Each detected feature becomes a separate layer in the 'LandTalk.AI' group</li>
-    <li><b>Show confidence scores:</b> Each feature includes a confidence percentage (0-100)</li>
-    <li><b>Provide explanations:</b> The AI explains why it identified each feature</li>
-    <li><b>Display labels:</b> Feature names and confidence scores are shown on the map</li>
-    <li><b>Results layers:</b> all new map layers are  stored as GeoPackages (gpkg) automatically in a directory called LandTalk.AI_Analysis where your project file is located. Delete unused layers. And you can modify this behavior in the Options menu.</li>
-</ul>
-"""
-
-# Tips & Tricks Tab Content
-TIPS_TRICKS_CONTENT = """
-<h2>⭐ Tips for Better Results</h2>
-<p>To get the best results from LandTalk.AI:</p>
-<ul>
-    <li><b>Add messages (prompts):</b> Asking more specifically for features you are interested in will guide the AI (e.g., 'Search for burial mounds')</li>
-    <li><b>Have a longer chat:</b> discuss the response with the AI across several chat steps to refine the results. For example "review the bounding box locations!" may result in an improvement.</li>
-    <li><b>Check image size.</b> Do not analyze areas that are too large. Try lower resolutions first. Processing of images that are too large takes much more time or might get rejected by the AI</li>
-    <li><b>Adjust resolution:</b> Higher resolution works better for very small features. Try it out!</li>
-    <li><b>Try different models:</b> Gemini, Gemma, GPT, and Claude may give different results, so often it is worth trying several models for best results</li>
-    <li><b>Adjust minimum confidence:</b> Filter out low-confidence detections if needed by using the 'Conf. (%)' field. 80% makes a good starting point but try different values</li>
-</ul>
-
-"""
-
-# FAQ Tab Content
-FAQ_CONTENT = """
-<h3>Q1: What types of features can LandTalk.AI detect?</h3>
-<p>LandTalk.AI can detect a wide variety of landscape features including buildings, roads, water bodies, vegetation, agricultural areas, infrastructure, and more. The specific features depend on the AI model used and your custom rules.</p>
+# Tab Content Files
+GETTING_STARTED_CONTENT_FILE = "tutorial_getting_started.html"
+TIPS_TRICKS_CONTENT_FILE = "tutorial_tips_tricks.html"
+FAQ_CONTENT_FILE = "tutorial_faq.html"
 
-<h3>Q2: How accurate are the AI detections?</h3>
-<p>Accuracy varies depending on image quality, feature clarity, and AI model. Each detection includes a confidence score. You can adjust the confidence threshold to show only high-confidence detections.</p>
-
-<h3>Q3: Can I use multiple AI providers?</h3>
-<p>Yes! You can switch between Gemini, Gemma, GPT, and Claude models at any time using the dropdown menu. Gemini and Gemma share the same Google API key. GPT requires an OpenAI key, and Claude requires an Anthropic key. Each model may provide different insights and detection capabilities.</p>
+# Button and UI Texts
+DONT_SHOW_AGAIN_TEXT = "Don't show this tutorial again"
+CLOSE_BUTTON_TEXT = "Close"
 
-<h3>Q4: What if the AI doesn't detect what I'm looking for?</h3>
-<p>Try adjusting your prompt to be more specific, lower the confidence threshold, try a different AI model, or customize the rules to focus on the features you're interested in.</p>
 
-<h3>Q5: Can I save my analysis results?</h3>
-<p>Yes! All analysis results are saved as GeoPackage files in the 'LandTalk.AI_Analysis' directory next to your QGIS project file. Check the Options button for alternatives to this behavior.</p>
+# The HTML files are indented for readability only. Their whitespace runs are
+# collapsed on load so the rich-text parser has fewer bytes to scan
+# (the content has no <pre> blocks, whose whitespace would matter).
+_RE_WHITESPACE_RUNS = re.compile(r'\s+')
 
-<h3>Q6: How do I customize the AI behavior?</h3>
-<p>Click the <b>Rules</b> button to customize how the AI analyzes your maps, what features to focus on, and how to structure the output.</p>
 
-<h3>Q7: What if I get an API key error?</h3>
-<p>Make sure you've entered a valid API key in the Options menu. Check that your API key has the necessary permissions and that you have sufficient credits/quota remaining.</p>
+@lru_cache(maxsize=None)
+def load_tutorial_content(file_name):
+    """
+    Load the HTML content of a tutorial tab.
 
-<h3>Q8: Can I analyze the same area multiple times?</h3>
-<p>Yes! You can continue conversations about the same area by adding new messages. The AI will remember the previous context and build upon it.</p>
+    Args:
+        file_name: Name of the content file in this directory (one of the *_CONTENT_FILE constants)
 
-<h3>Q9: How do I remove old analysis results?</h3>
-<p>You can delete individual layers from the 'LandTalk.AI' group in QGIS, or delete the entire group to remove all analysis results. The files in the analysis directory should then be deleted manually.</p>
-"""
-
-# Button and UI Texts
-DONT_SHOW_AGAIN_TEXT = "Don't show this tutorial again"
-CLOSE_BUTTON_TEXT = "Close"
+    Returns:
+        str: HTML content with collapsed whitespace
+    """
+    path = os.path.join(os.path.dirname(__file__), file_name)
+    with open(path, 'r', encoding='utf-8') as f:
+        return _RE_WHITESPACE_RUNS.sub(' ', f.read()).strip()
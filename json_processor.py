@@ -18,7 +18,37 @@
  ***************************************************************************/
 """
 
-from .logging import logger
+import sys
+from typing import NamedTuple, Optional
+from .logging import logger, DEBUG
+
+# Keys under which a response dict may hold its list of detection items, in priority order
+ITEM_CONTAINER_KEYS = ('objects', 'detections', 'features')
+
+# Accepted field name variants for detection items (lowercase, in priority order)
+_OBJECT_TYPE_FIELDS = ('label', 'object_type', 'object type')
+_PROBABILITY_FIELDS = ('probability', 'confidence', 'confidence_score', 'confidence score', 'prob', 'score')
+_POINT_FIELDS = ('point', 'points', 'coordinates')
+_BBOX_FIELDS = ('bounding_box', 'bounding box', 'bbox', 'box_2d', 'box2d')
+_REASON_FIELDS = ('reason', 'explanation', 'description')
+
+# Exact key set of the item format requested by the default system prompt
+_PROMPTED_FORMAT_FIELDS = frozenset(('box_2d', 'label', 'probability', 'reason'))
+
+# Key sets of the alternative bounding box formats
+_XYWH_FIELDS = frozenset(('x', 'y', 'width', 'height'))
+_XYXY_FIELDS = frozenset(('xmin', 'ymin', 'xmax', 'ymax'))
+
+
+class FeatureRecord(NamedTuple):
+    """Detection feature ready for layer creation (coordinates in raw 0-1000 format)"""
+    label: str
+    object_type: str
+    probability: Optional[float]
+    result_number: int
+    reason: Optional[str]
+    box_2d: Optional[tuple] = None
+    point: Optional[tuple] = None
 
 
 class AIResponseProcessor:
@@ -32,62 +62,87 @@ class AIResponseProcessor:
             confidence_threshold: Minimum confidence percentage (0-100) to include detections
         """
         self.confidence_threshold = confidence_threshold
+        # Whether the per-item field debug messages are logged (checked once, not per item)
+        self._log_fields = logger.is_enabled_for(DEBUG)
 
     def process_json_response(self, my_json):
         """
         Process JSON data and extract valid features.
 
+        The data arrives already decoded: GenAIHandler.extract_json_from_response
+        parses it with json_utils (orjson when installed) and validates it, so no
+        raw JSON text is decoded here. Accepted structures are a list of detection
+        items, a dict holding such a list under 'objects', 'detections' or
+        'features', or a single detection item dict.
+
+        Items are processed sequentially in a single pass. The per-item work is
+        pure Python that holds the GIL, so worker threads would not run it in
+        parallel, and worker processes spawned from inside QGIS would have to
+        start a new interpreter for the few dozen items a response contains.
+
         Args:
             my_json: JSON data from AI response (dict or list)
 
         Returns:
             tuple: (features_data, stats) where:
-                - features_data: List of feature dictionaries ready for layer creation
+                - features_data: List of FeatureRecord items ready for layer creation
                 - stats: Dictionary with processing statistics
         """
         if not my_json:
             logger.info("No JSON data provided")
             return [], self._empty_stats()
 
-        # Extract items from various JSON structures
-        items_to_process = self._extract_items_from_json(my_json)
-
-        # Process all items
+        # Process all items, taken directly from the JSON structure
         features_data = []
-        stats = {
-            'total': len(items_to_process),
-            'processed': 0,
-            'skipped_confidence': 0,
-            'skipped_missing': 0
-        }
+        # Counted in locals, the statistics dictionary is built once at the end
+        total = skipped_missing = skipped_confidence = 0
+
+        logger.info("Processing items from JSON response")
+
+        # Per-item messages are only formatted when they will actually be logged
+        log_items = logger.is_enabled_for(DEBUG)
+
+        # Filtering happens in the same pass as field extraction, which has to
+        # walk every item in Python anyway; keep the loop invariants local
+        confidence_threshold = self.confidence_threshold
+        extract_fields = self._extract_detection_fields
 
-        logger.info(f"Processing {stats['total']} items from JSON response")
+        for i, item in enumerate(self._iter_items_from_json(my_json)):
+            total += 1
 
-        for i, item in enumerate(items_to_process):
             # Extract fields from the item
-            fields = self._extract_detection_fields(item, i)
+            fields = extract_fields(item, i)
             if fields is None:
-                stats['skipped_missing'] += 1
+                skipped_missing += 1
                 continue
 
             # Check if we have required data
             if not fields['object_type'] or (not fields['bbox_coords'] and not fields['point_coords']):
                 logger.warning(f"Skipping item {i+1}: missing object_type ({fields['object_type']}) or coordinates")
-                stats['skipped_missing'] += 1
+                skipped_missing += 1
                 continue
 
             # Apply confidence filtering
-            if fields['probability'] is not None and fields['probability'] < self.confidence_threshold:
-                logger.info(f"Skipping item {i+1}: {fields['object_type']} with confidence {fields['probability']:.1f}% below threshold {self.confidence_threshold}%")
-                stats['skipped_confidence'] += 1
+            probability = fields['probability']
+            if probability is not None and probability < confidence_threshold:
+                if log_items:
+                    logger.debug(f"Skipping item {i+1}: {fields['object_type']} with confidence {probability:.1f}% below threshold {confidence_threshold}%")
+                skipped_confidence += 1
                 continue
 
-            # Create feature dictionary
+            # Create feature record
             result_number = i + 1
-            feature_dict = self._create_feature_dict(fields, result_number)
-            features_data.append(feature_dict)
-            stats['processed'] += 1
-            logger.info(f"Processed item {i+1}: {feature_dict['label']}")
+            record = self._create_feature_record(fields, result_number)
+            features_data.append(record)
+            if log_items:
+                logger.debug(f"Processed item {i+1}: {record.label}")
+
+        stats = {
+            'total': total,
+            'processed': len(features_data),
+            'skipped_confidence': skipped_confidence,
+            'skipped_missing': skipped_missing
+        }
 
         # Log processing summary
         self._log_processing_summary(stats)
@@ -103,48 +158,51 @@ class AIResponseProcessor:
             'skipped_missing': 0
         }
 
-    def _get_field_case_insensitive(self, obj, *field_names):
+    def _get_field_case_insensitive(self, obj, obj_keys_lower, field_names):
         """
         Get value from object using case-insensitive field lookup.
 
         Args:
             obj: Dictionary to search
-            field_names: Possible field names to look for
+            obj_keys_lower: Mapping of lowercased keys to the actual keys of obj,
+                or None if all keys of obj are lowercase already
+            field_names: Possible lowercase field names to look for
 
         Returns:
             tuple: (value, actual_key) or (None, None) if not found
         """
-        if not isinstance(obj, dict):
+        if obj_keys_lower is None:
+            for field_name in field_names:
+                if field_name in obj:
+                    return obj[field_name], field_name
             return None, None
 
-        obj_keys_lower = {k.lower(): k for k in obj.keys()}
         for field_name in field_names:
-            field_lower = field_name.lower()
-            if field_lower in obj_keys_lower:
-                actual_key = obj_keys_lower[field_lower]
+            actual_key = obj_keys_lower.get(field_name)
+            if actual_key is not None:
                 return obj[actual_key], actual_key
         return None, None
 
-    def _extract_items_from_json(self, my_json):
+    def _iter_items_from_json(self, my_json):
         """
-        Extract items list from various JSON structures.
+        Iterate over the items of various JSON structures without copying them.
 
         Args:
             my_json: JSON data (list or dict)
 
-        Returns:
-            list: List of items to process
+        Yields:
+            Items to process
         """
         if isinstance(my_json, list):
-            return my_json
+            yield from my_json
         elif isinstance(my_json, dict):
             # Try common container keys
-            for key in ['objects', 'detections', 'features']:
+            for key in ITEM_CONTAINER_KEYS:
                 if key in my_json:
-                    return my_json[key]
+                    yield from my_json[key]
+                    return
             # Single object, treat as single item
-            return [my_json]
-        return []
+            yield my_json
 
     def _parse_probability(self, prob_value):
         """
@@ -156,24 +214,24 @@ class AIResponseProcessor:
         Returns:
             float: Probability as percentage (0-100) or None if invalid
         """
-        if prob_value is None:
-            return None
-
-        try:
-            if isinstance(prob_value, (int, float)):
-                probability = float(prob_value)
-            elif isinstance(prob_value, str):
-                # Handle percentage strings like "85%" or "0.85"
-                prob_str = prob_value.replace('%', '').strip()
+        # Numbers are by far the most common case and are used as given
+        value_type = type(prob_value)
+        if value_type is float:
+            return prob_value
+        if value_type is int:
+            return float(prob_value)
+        if value_type is str:
+            # Handle percentage strings like "85%" or "0.85"
+            prob_str = prob_value.strip()
+            if prob_str.endswith('%'):
+                prob_str = prob_str[:-1].rstrip()
+            try:
                 probability = float(prob_str)
-                # If value is between 0 and 1, convert to percentage
-                if probability <= 1.0:
-                    probability *= 100
-            else:
+            except ValueError:
                 return None
-            return probability
-        except (ValueError, TypeError):
-            return None
+            # If value is between 0 and 1, convert to percentage
+            return probability * 100 if probability <= 1.0 else probability
+        return None
 
     def _extract_detection_fields(self, item, i):
         """
@@ -190,57 +248,47 @@ class AIResponseProcessor:
             logger.warning(f"Skipping item {i+1}: not a dictionary (type: {type(item)}, value: {item})")
             return None
 
+        # Items in exactly the prompted format need no field name search
+        if item.keys() == _PROMPTED_FORMAT_FIELDS:
+            return self._extract_prompted_fields(item, i)
+
+        # Most responses use lowercase keys already, only map mixed-case keys
+        # (once for all field lookups of this item)
+        if all(map(str.islower, item)):
+            item_keys_lower = None
+        else:
+            item_keys_lower = {k.lower(): k for k in item}
+
         # Extract object type/label
         object_type, object_type_field = self._get_field_case_insensitive(
-            item, 'label', 'object_type', 'object type'
+            item, item_keys_lower, _OBJECT_TYPE_FIELDS
         )
         if object_type:
-            object_type = str(object_type)
-            logger.debug(f"Item {i+1}: Found object_type '{object_type}' in field '{object_type_field}'")
-        else:
+            # Responses repeat a handful of labels many times, share one string per label
+            object_type = sys.intern(str(object_type))
+            if self._log_fields:
+                logger.debug(f"Item {i+1}: Found object_type '{object_type}' in field '{object_type_field}'")
+        elif self._log_fields:
             logger.debug(f"Item {i+1}: No object_type found. Available keys: {list(item.keys())}")
 
-        # Extract probability
-        prob_value, prob_field = self._get_field_case_insensitive(
-            item, 'probability', 'confidence', 'confidence_score', 'confidence score', 'prob', 'score'
-        )
-        probability = self._parse_probability(prob_value)
-
-        # Extract point coordinates
-        point_coords = None
-        point_data, point_field = self._get_field_case_insensitive(item, 'point', 'points', 'coordinates')
-        if point_data and isinstance(point_data, list) and len(point_data) >= 2:
-            point_coords = tuple(point_data[:2])
-
-        # Extract bounding box
-        bbox_coords = None
-        bbox_data, bbox_field = self._get_field_case_insensitive(
-            item, 'bounding_box', 'bounding box', 'bbox', 'box_2d', 'box2d'
-        )
-        if bbox_data and isinstance(bbox_data, list) and len(bbox_data) >= 4:
-            bbox_coords = tuple(bbox_data[:4])
+        # Extract probability and coordinates
+        probability = self._extract_probability(item, item_keys_lower)
+        point_coords = self._extract_point(item, item_keys_lower)
+        bbox_coords = self._extract_bbox(item, item_keys_lower)
 
         # Alternative coordinate formats
         if not bbox_coords and not point_coords:
-            # Try x, y, width, height format
-            coord_fields = ['x', 'y', 'width', 'height']
-            if all(field in item for field in coord_fields):
-                x, y, w, h = item['x'], item['y'], item['width'], item['height']
-                bbox_coords = (x, y, x + w, y + h)
-            else:
-                # Try xmin, ymin, xmax, ymax format
-                coord_fields = ['xmin', 'ymin', 'xmax', 'ymax']
-                if all(field in item for field in coord_fields):
-                    bbox_coords = (item['xmin'], item['ymin'], item['xmax'], item['ymax'])
+            bbox_coords = self._extract_alternative_bbox(item)
 
         # Extract reason/explanation
         reason = None
         reason_value, reason_field = self._get_field_case_insensitive(
-            item, 'reason', 'explanation', 'description'
+            item, item_keys_lower, _REASON_FIELDS
         )
         if reason_value:
             reason = str(reason_value)
-            logger.debug(f"Item {i+1}: Found reason in field '{reason_field}'")
+            if self._log_fields:
+                logger.debug(f"Item {i+1}: Found reason in field '{reason_field}'")
 
         return {
             'object_type': object_type,
@@ -250,41 +298,142 @@ class AIResponseProcessor:
             'reason': reason
         }
 
-    def _create_feature_dict(self, fields, result_number):
+    def _extract_prompted_fields(self, item, i):
         """
-        Create feature dictionary for layer creation.
+        Extract fields from a detection item in exactly the prompted format.
+
+        Produces the same result as the generic field search for an item whose
+        keys are exactly 'box_2d', 'label', 'probability' and 'reason'.
+
+        Args:
+            item: Detection item dictionary
+            i: Item index (for logging)
+
+        Returns:
+            dict: Dictionary with extracted fields
+        """
+        object_type = item['label']
+        if object_type:
+            object_type = sys.intern(str(object_type))
+            if self._log_fields:
+                logger.debug(f"Item {i+1}: Found object_type '{object_type}' in field 'label'")
+        elif self._log_fields:
+            logger.debug(f"Item {i+1}: No object_type found. Available keys: {list(item.keys())}")
+
+        bbox_coords = None
+        bbox_data = item['box_2d']
+        if type(bbox_data) is list and len(bbox_data) >= 4:
+            bbox_coords = (bbox_data[0], bbox_data[1], bbox_data[2], bbox_data[3])
+
+        reason = None
+        if item['reason']:
+            reason = str(item['reason'])
+            if self._log_fields:
+                logger.debug(f"Item {i+1}: Found reason in field 'reason'")
+
+        return {
+            'object_type': object_type,
+            'probability': self._parse_probability(item['probability']),
+            'bbox_coords': bbox_coords,
+            'point_coords': None,
+            'reason': reason
+        }
+
+    def _extract_probability(self, item, item_keys_lower):
+        """
+        Extract the probability of a detection item.
+
+        Args:
+            item: Detection item dictionary
+            item_keys_lower: Lowercased key mapping of item (see _get_field_case_insensitive)
+
+        Returns:
+            float: Probability as percentage (0-100) or None if missing or invalid
+        """
+        prob_value, _ = self._get_field_case_insensitive(item, item_keys_lower, _PROBABILITY_FIELDS)
+        return self._parse_probability(prob_value)
+
+    def _extract_point(self, item, item_keys_lower):
+        """
+        Extract the point coordinates of a detection item.
+
+        Args:
+            item: Detection item dictionary
+            item_keys_lower: Lowercased key mapping of item (see _get_field_case_insensitive)
+
+        Returns:
+            tuple: (x, y) in raw 0-1000 format or None if missing or invalid
+        """
+        point_data, _ = self._get_field_case_insensitive(item, item_keys_lower, _POINT_FIELDS)
+        if type(point_data) is list and len(point_data) >= 2:
+            return (point_data[0], point_data[1])
+        return None
+
+    def _extract_bbox(self, item, item_keys_lower):
+        """
+        Extract the bounding box of a detection item.
+
+        Args:
+            item: Detection item dictionary
+            item_keys_lower: Lowercased key mapping of item (see _get_field_case_insensitive)
+
+        Returns:
+            tuple: Four bounding box values in raw 0-1000 format or None if missing or invalid
+        """
+        bbox_data, _ = self._get_field_case_insensitive(item, item_keys_lower, _BBOX_FIELDS)
+        if type(bbox_data) is list and len(bbox_data) >= 4:
+            return (bbox_data[0], bbox_data[1], bbox_data[2], bbox_data[3])
+        return None
+
+    @staticmethod
+    def _extract_alternative_bbox(item):
+        """
+        Extract a bounding box given as separate x/y/width/height or xmin/ymin/xmax/ymax fields.
+
+        Args:
+            item: Detection item dictionary
+
+        Returns:
+            tuple: (x1, y1, x2, y2) or None if neither format is present
+        """
+        item_keys = item.keys()
+        if _XYWH_FIELDS <= item_keys:
+            x, y = item['x'], item['y']
+            return (x, y, x + item['width'], y + item['height'])
+        if _XYXY_FIELDS <= item_keys:
+            return (item['xmin'], item['ymin'], item['xmax'], item['ymax'])
+        return None
+
+    def _create_feature_record(self, fields, result_number):
+        """
+        Create feature record for layer creation.
 
         Args:
             fields: Dictionary with extracted fields
             result_number: Sequential number for this result
 
         Returns:
-            dict: Feature dictionary with all required fields
+            FeatureRecord: Feature record with all required fields
         """
         object_type = fields['object_type']
         probability = fields['probability']
 
-        # Create enhanced label
+        # Create enhanced label (a single f-string is as fast as a cached %-template)
         if probability is not None:
             enhanced_label = f"({result_number}) {object_type} ({probability:.0f}%)"
         else:
             enhanced_label = f"({result_number}) {object_type}"
 
-        feature_dict = {
-            'label': enhanced_label,
-            'object_type': object_type,
-            'probability': probability,
-            'result_number': result_number,
-            'reason': fields['reason']
-        }
-
-        # Add geometry info in raw 0-1000 format
-        if fields['bbox_coords']:
-            feature_dict['box_2d'] = fields['bbox_coords']
-        if fields['point_coords']:
-            feature_dict['point'] = fields['point_coords']
-
-        return feature_dict
+        # Geometry info stays in raw 0-1000 format
+        return FeatureRecord(
+            label=enhanced_label,
+            object_type=object_type,
+            probability=probability,
+            result_number=result_number,
+            reason=fields['reason'],
+            box_2d=fields['bbox_coords'] or None,
+            point=fields['point_coords'] or None
+        )
 
     def _log_processing_summary(self, stats):
         """
@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+JSON utilities for LandTalk.AI plugin
+
+This module provides fast JSON encoding and decoding. orjson is used when it is
+installed in the QGIS Python environment. Without orjson, documents are decoded
+with pysimdjson when that is installed, and everything else falls back to the
+standard library json module.
+"""
+
+import json
+import threading
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:
+    simdjson = None
+
+# orjson.JSONDecodeError is a subclass, so callers can always catch this
+JSONDecodeError = json.JSONDecodeError
+
+# simdjson parsers reuse their internal buffers between documents but must not be
+# shared between threads, so each request pool and AI worker thread keeps its own parser
+_simdjson_state = threading.local()
+
+
+def _simdjson_loads(data):
+    """Decode a JSON document with the calling thread's reusable simdjson parser"""
+    parser = getattr(_simdjson_state, 'parser', None)
+    if parser is None:
+        parser = _simdjson_state.parser = simdjson.Parser()
+    try:
+        # Fully convert to Python objects, lazy proxies are invalidated by the next parse
+        return parser.parse(data, True)
+    except ValueError as e:
+        if isinstance(data, bytes):
+            data = data.decode('utf-8', errors='replace')
+        raise JSONDecodeError(str(e), data, 0) from e
+
+
+def loads(data):
+    """Decode a JSON document
+
+    Args:
+        data: JSON text as str or UTF-8 encoded bytes
+
+    Returns:
+        Decoded Python object
+
+    Raises:
+        JSONDecodeError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if simdjson is not None:
+        return _simdjson_loads(data)
+    return json.loads(data)
+
+
+def dumps_pretty(obj):
+    """Encode an object as indented JSON text for logging
+
+    Args:
+        obj: JSON-serializable Python object
+
+    Returns:
+        str: JSON document indented by two spaces
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def dumps_bytes(obj):
+    """Encode an object as compact UTF-8 JSON
+
+    Args:
+        obj: JSON-serializable Python object
+
+    Returns:
+        bytes: Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
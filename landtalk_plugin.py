@@ -27,41 +27,49 @@
 """
 
 import os
+import re
 import tempfile
-import base64
 from datetime import datetime
-from .genai import GenAIHandler
-from .logging import logger
-from .dock_widget import LandTalkDockWidget
-from .map_tools import RectangleMapTool, MapRenderer
-from .tutorial_dialog import TutorialDialog
-from .layer_manager import LayerManager
-from .config_manager import PluginConfigManager
+from .logging import logger, DEBUG
 from .constants import PluginConstants
-from .json_processor import AIResponseProcessor
-from .analysis_coordinator import AnalysisCoordinator
-from .dock_widget_initializer import DockWidgetInitializer
 from .map_capture_state import MapCaptureState
-from .message_formatter import MessageFormatter
-from qgis.PyQt.QtCore import Qt, QRectF, QSize, pyqtSignal, QPointF, QPoint
-from qgis.PyQt.QtGui import QIcon, QColor, QPixmap
-from qgis.PyQt.QtWidgets import (
-    QDialog, QVBoxLayout, QHBoxLayout,
-    QLabel, QTextEdit, QPushButton, QMessageBox,
-    QLineEdit, QDockWidget, QFileDialog
-)
-try:
+# All other plugin modules are imported where they are first used, so loading
+# the plugin at QGIS startup does not import the AI client stack (genai,
+# requests) or build any helper that the session might never need
+from qgis.PyQt.QtCore import Qt, pyqtSlot, PYQT_VERSION_STR
+from qgis.PyQt.QtGui import QIcon, QColor
+from qgis.PyQt.QtWidgets import QMessageBox, QFileDialog, QMenu
+if PYQT_VERSION_STR.startswith('6'):
     from qgis.PyQt.QtGui import QAction  # PyQt6
-except Exception:
+else:
     from qgis.PyQt.QtWidgets import QAction  # PyQt5
 
-from qgis.core import (
-    Qgis, QgsProject, QgsWkbTypes, QgsRectangle,
-    QgsSingleSymbolRenderer, QgsLayerTreeGroup
-)
-from qgis.PyQt.QtCore import QVariant, QTimer
+from qgis.core import Qgis, QgsProject, QgsWkbTypes, QgsLayerTreeGroup, QgsGeometry
 from qgis.gui import QgsRubberBand
 
+# Characters removed from group names in default export file names
+# (\w covers exactly the str.isalnum() characters plus '_')
+_RE_UNSAFE_FILENAME_CHARS = re.compile(r'[^\w \-]')
+
+# Selection rubber band style (QgsRubberBand copies the colors it is given)
+_SELECTION_COLOR = QColor(255, 255, 255, 255)  # White color
+_SELECTION_OUTLINE_COLOR = QColor(0, 0, 0, 255)  # Black outline
+
+
+def _default_export_filename(group_name):
+    """
+    Build the default GeoPackage file name for exporting a layer group.
+
+    Args:
+        group_name: Name of the exported layer group
+
+    Returns:
+        str: File name of the form landtalk_<safe group name>_<timestamp>.gpkg
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    safe_name = _RE_UNSAFE_FILENAME_CHARS.sub('', group_name).strip()
+    return f"landtalk_{safe_name}_{timestamp}.gpkg"
+
 
 class LandTalkPlugin:
     """QGIS plugin for analyzing map areas using LandTalk AI (Google Gemini or GPT)."""
@@ -80,11 +88,16 @@ class LandTalkPlugin:
         self.rubber_band = None
         self.map_tool = None
         self.dock_widget = None
-        self.actions = []
         self.menu = 'LandTalk.ai'
         self.action = None
         self.selected_rectangle = None
 
+        # Layer tree context menu hook, connected once a LandTalk.ai group exists
+        self._layer_tree_view = None
+
+        # The tutorial is offered at most once per QGIS session
+        self._tutorial_shown = False
+
         # Map capture state - consolidated state management
         self.capture_state = MapCaptureState()
 
@@ -97,30 +110,80 @@ class LandTalkPlugin:
         # Fixed ground resolution in meters per pixel (applies to rendered output)
         self.ground_resolution_m_per_px = PluginConstants.DEFAULT_GROUND_RESOLUTION_M_PER_PX
 
-        # Initialize map renderer
-        self.map_renderer = MapRenderer(self.map_canvas, self.ground_resolution_m_per_px)
-
         # Initialize GenAI handler lazily to avoid startup delays
         self.genai_handler = None
 
         # Initialize AI worker thread (will be created when needed)
         self.ai_worker = None
 
-        # Initialize LayerManager to handle all layer operations
-        self.layer_manager = LayerManager(self)
-
-        # Initialize ConfigManager to handle all configuration operations
-        self.config_manager = PluginConfigManager(self.plugin_dir, self.iface)
-
-        # Initialize AnalysisCoordinator to handle AI analysis workflow
-        self.analysis_coordinator = AnalysisCoordinator(self)
-
-        # Initialize DockWidgetInitializer for UI setup
-        self.dock_initializer = DockWidgetInitializer(self.iface, self.config_manager, self.plugin_dir)
+        # Helpers are created on first access (see the properties below), since
+        # QGIS constructs every installed plugin at startup
+        self._map_renderer = None
+        self._layer_manager = None
+        self._config_manager = None
+        self._analysis_coordinator = None
+        self._dock_initializer = None
+        self._project = None
+        self._main_window = None
+
+    @property
+    def main_window(self):
+        """The QGIS main window (parent of the plugin's dialogs), looked up once"""
+        if self._main_window is None:
+            self._main_window = self.iface.mainWindow()
+        return self._main_window
+
+    @property
+    def project(self):
+        """The QgsProject singleton, looked up once"""
+        if self._project is None:
+            self._project = QgsProject.instance()
+        return self._project
+
+    @property
+    def map_renderer(self):
+        """Map renderer, created on first access"""
+        if self._map_renderer is None:
+            from .map_tools import MapRenderer
+            self._map_renderer = MapRenderer(self.map_canvas, self.ground_resolution_m_per_px)
+        return self._map_renderer
+
+    @property
+    def layer_manager(self):
+        """LayerManager handling all layer operations, created on first access"""
+        if self._layer_manager is None:
+            from .layer_manager import LayerManager
+            self._layer_manager = LayerManager(self)
+        return self._layer_manager
+
+    @property
+    def config_manager(self):
+        """PluginConfigManager handling all configuration operations, created on first access"""
+        if self._config_manager is None:
+            from .config_manager import PluginConfigManager
+            self._config_manager = PluginConfigManager(self.plugin_dir, self.iface)
+        return self._config_manager
+
+    @property
+    def analysis_coordinator(self):
+        """AnalysisCoordinator handling the AI analysis workflow, created on first access"""
+        if self._analysis_coordinator is None:
+            from .analysis_coordinator import AnalysisCoordinator
+            self._analysis_coordinator = AnalysisCoordinator(self)
+        return self._analysis_coordinator
+
+    @property
+    def dock_initializer(self):
+        """DockWidgetInitializer for UI setup, created on first access"""
+        if self._dock_initializer is None:
+            from .dock_widget_initializer import DockWidgetInitializer
+            self._dock_initializer = DockWidgetInitializer(self.iface, self.config_manager, self.plugin_dir)
+        return self._dock_initializer
 
     def get_genai_handler(self):
         """Get GenAI handler, creating it lazily if needed"""
         if self.genai_handler is None:
+            from .genai import GenAIHandler
             self.genai_handler = GenAIHandler(self.gemini_api_url, self.gpt_api_url, self.claude_api_url, self.api_timeout)
         return self.genai_handler
 
@@ -130,19 +193,18 @@ class LandTalkPlugin:
         self.action = QAction(
             QIcon(icon_path),
             "Analyze with LandTalk.AI",
-            self.iface.mainWindow()
+            self.main_window
         )
         self.action.triggered.connect(self.run)
         self.iface.addToolBarIcon(self.action)
         self.iface.addPluginToMenu(self.menu, self.action)
-        self.actions.append(self.action)
         
         # Set status tip and what's this text
         self.action.setStatusTip("Analyze map areas with LandTalk.AI")
         self.action.setWhatsThis("Analyze selected map areas using LandTalk.AI")
         
         # Connect to project signals to handle project open/close events
-        project = QgsProject.instance()
+        project = self.project
         project.readProject.connect(self.on_project_opened)
 
         # Connect to writeProject to auto-convert memory layers before project is saved
@@ -152,24 +214,26 @@ class LandTalkPlugin:
         # Connect to cleared signal for cleanup
         project.cleared.connect(self.on_project_closed)
 
-        # Connect to layer tree view context menu for right-click export
-        self.setup_layer_tree_context_menu()
+        # The layer tree context menu for right-click export is connected once a
+        # project with a LandTalk.ai group is opened or the group is created
 
 
     def unload(self):
         """Removes the plugin menu item and icon from QGIS GUI."""
         # Disconnect project signals first
         try:
-            project = QgsProject.instance()
+            project = self.project
             project.readProject.disconnect(self.on_project_opened)
             project.writeProject.disconnect(self.on_project_about_to_be_saved)
             project.cleared.disconnect(self.on_project_closed)
         except Exception as e:
             logger.warning(f"Could not disconnect project signals: {str(e)}")
+
+        self.teardown_layer_tree_context_menu()
         
-        for action in self.actions:
-            self.iface.removePluginMenu(self.menu, action)
-            self.iface.removeToolBarIcon(action)
+        if self.action:
+            self.iface.removePluginMenu(self.menu, self.action)
+            self.iface.removeToolBarIcon(self.action)
         if self.rubber_band:
             self.map_canvas.scene().removeItem(self.rubber_band)
             self.rubber_band = None
@@ -177,8 +241,9 @@ class LandTalkPlugin:
             self.map_canvas.unsetMapTool(self.map_tool)
             self.map_tool = None
 
-        # Save settings before unloading
-        self.config_manager.save_settings()
+        # Save settings before unloading (nothing to save if they were never loaded)
+        if self._config_manager is not None:
+            self._config_manager.save_settings()
 
         # Cleanup AI worker thread if running
         if self.ai_worker and self.ai_worker.isRunning():
@@ -186,6 +251,10 @@ class LandTalkPlugin:
             self.ai_worker.terminate()
             self.ai_worker.wait()
             self.ai_worker = None
+
+        # Release the thread pools and pooled API connections
+        if self.genai_handler:
+            self.genai_handler.close()
         
         # Cleanup dock widget if open
         if self.dock_widget:
@@ -194,41 +263,52 @@ class LandTalkPlugin:
     def is_project_open(self):
         """Check if a QGIS project is currently open"""
         try:
-            project = QgsProject.instance()
+            project = self.project
             # A project is considered open if it has a valid file path or layers
-            return (project.fileName() and project.fileName().strip()) or len(project.mapLayers()) > 0
+            file_name = project.fileName()
+            return bool(file_name and file_name.strip()) or project.count() > 0
         except Exception:
             return False
 
+    @pyqtSlot()
     def on_project_opened(self):
         """Handle project opened event"""
         logger.info("Project opened - LandTalk Plugin is now available")
 
-        # Show user where analysis files will be saved
-        analysis_dir = self.layer_manager.get_analysis_directory()
-        if analysis_dir:
-            logger.info(f"LandTalk.AI analysis files will be saved to: {analysis_dir}")
+        # Offer the export context menu if the project has earlier results
+        # (checked on the class, so opening a project does not create the LayerManager)
+        from .layer_manager import LayerManager
+        if LayerManager.has_landtalk_group():
+            self.setup_layer_tree_context_menu()
+
+        # Show user where analysis files will be saved (once the plugin has been used)
+        if self._layer_manager is not None:
+            analysis_dir = self._layer_manager.get_analysis_directory()
+            if analysis_dir:
+                logger.info(f"LandTalk.AI analysis files will be saved to: {analysis_dir}")
 
+    @pyqtSlot()
     def on_project_about_to_be_saved(self):
         """Handle project about to be saved - prompt or auto-convert memory layers to file-based before save"""
+        # Nothing to convert unless this session created LandTalk memory layers
+        if self._layer_manager is None or not self._layer_manager.memory_layers_created:
+            return
+
         logger.info("Project about to be saved - checking for memory layers to convert")
 
         try:
             # Check if there are any LandTalk memory layers
-            project = QgsProject.instance()
-            root = project.layerTreeRoot()
+            root = self.project.layerTreeRoot()
             landtalk_group = root.findGroup("LandTalk.ai")
 
             if not landtalk_group:
                 return
 
-            # Check for memory layers
-            memory_layers_exist = False
-            for layer_tree_layer in landtalk_group.findLayers():
-                layer = layer_tree_layer.layer()
-                if layer and layer.isValid() and layer.providerType() == "memory":
-                    memory_layers_exist = True
-                    break
+            # Check for memory layers (stops at the first one found)
+            memory_layers_exist = any(
+                layer and layer.isValid() and layer.providerType() == "memory"
+                for layer in (layer_tree_layer.layer() for layer_tree_layer in landtalk_group.findLayers())
+            )
 
             if not memory_layers_exist:
                 logger.info("No memory layers found in LandTalk.ai group")
@@ -245,7 +325,7 @@ class LandTalkPlugin:
 
                 # Ask user if they want to save the memory layers
                 reply = QMessageBox.question(
-                    self.iface.mainWindow(),
+                    self.main_window,
                     "Save Analysis Layers",
                     "You have temporary LandTalk.AI analysis layers that will be lost when the project closes.\n\n"
                     "Do you want to save them to a GeoPackage file?\n\n"
@@ -277,14 +357,14 @@ class LandTalkPlugin:
                         else:
                             logger.warning("Failed to convert some memory layers to file-based")
                             QMessageBox.warning(
-                                self.iface.mainWindow(),
+                                self.main_window,
                                 "Save Failed",
                                 "Failed to convert memory layers to file-based layers."
                             )
                     else:
                         logger.warning("Failed to save memory layers to GeoPackage")
                         QMessageBox.warning(
-                            self.iface.mainWindow(),
+                            self.main_window,
                             "Save Failed",
                             "Failed to save layers to GeoPackage file."
                         )
@@ -301,6 +381,7 @@ class LandTalkPlugin:
         except Exception as e:
             logger.error(f"Error in on_project_about_to_be_saved: {str(e)}")
 
+    @pyqtSlot()
     def on_project_closed(self):
         """Handle project closed event - reset plugin state completely"""
         logger.info("Project closed - resetting LandTalk Plugin state")
@@ -336,6 +417,9 @@ class LandTalkPlugin:
         # Cleanup any active selection
         self.cleanup_selection()
 
+        # The closed project's LandTalk.ai group is gone with it
+        self.teardown_layer_tree_context_menu()
+
         # Clear captured image data
         self.capture_state.clear()
 
@@ -347,7 +431,7 @@ class LandTalkPlugin:
         # Check if a project is open before starting rectangle selection
         if not self.is_project_open():
             QMessageBox.warning(
-                self.iface.mainWindow(),
+                self.main_window,
                 "No Project Open",
                 "Please open a QGIS project before selecting a map area.\n\n"
                 "The plugin requires an active project to analyze map areas."
@@ -366,6 +450,7 @@ class LandTalkPlugin:
         logger.info(f"Saving previous map tool: {self.previous_map_tool}")
 
         # Create a map tool for selecting a rectangle
+        from .map_tools import RectangleMapTool
         self.map_tool = RectangleMapTool(self.map_canvas)
         self.map_canvas.setMapTool(self.map_tool)
         self.map_tool.rectangle_created.connect(self.on_rectangle_created)
@@ -387,7 +472,7 @@ class LandTalkPlugin:
         # Check if a project is open before starting
         if not self.is_project_open():
             QMessageBox.warning(
-                self.iface.mainWindow(),
+                self.main_window,
                 "No Project Open",
                 "Please open a QGIS project before using the LandTalk Plugin.\n\n"
                 "The plugin requires an active project to analyze map areas."
@@ -413,8 +498,8 @@ class LandTalkPlugin:
             self.dock_widget.raise_()
             self.dock_widget.activateWindow()  # Bring it to front and give it focus
 
-            # Show tutorial for first-time users
-            if self.config_manager.show_tutorial:
+            # Show tutorial for first-time users (once per session)
+            if not self._tutorial_shown and self.config_manager.show_tutorial:
                 self.show_tutorial_dialog()
 
         logger.info("Please select a rectangular area on the map.")
@@ -425,17 +510,32 @@ class LandTalkPlugin:
         )
 
     def setup_layer_tree_context_menu(self):
-        """Setup context menu for layer tree to add export functionality"""
+        """Setup context menu for layer tree to add export functionality (connects only once)"""
+        if self._layer_tree_view is not None:
+            return
         try:
             # Get the layer tree view
             layer_tree_view = self.iface.layerTreeView()
             if layer_tree_view:
                 # Connect to the context menu signal
                 layer_tree_view.contextMenuAboutToShow.connect(self.on_layer_tree_context_menu)
+                self._layer_tree_view = layer_tree_view
                 logger.info("Connected layer tree context menu")
         except Exception as e:
             logger.error(f"Error setting up layer tree context menu: {str(e)}")
 
+    def teardown_layer_tree_context_menu(self):
+        """Disconnect the layer tree context menu handler if it is connected"""
+        if self._layer_tree_view is None:
+            return
+        try:
+            self._layer_tree_view.contextMenuAboutToShow.disconnect(self.on_layer_tree_context_menu)
+            logger.info("Disconnected layer tree context menu")
+        except Exception as e:
+            logger.warning(f"Could not disconnect layer tree context menu: {str(e)}")
+        self._layer_tree_view = None
+
+    @pyqtSlot(QMenu)
     def on_layer_tree_context_menu(self, menu):
         """Handle layer tree context menu to add export option for LandTalk groups
 
@@ -443,12 +543,13 @@ class LandTalkPlugin:
             menu: QMenu object to add items to
         """
         try:
-            # Get the currently selected layer tree node
-            layer_tree_view = self.iface.layerTreeView()
-            if not layer_tree_view:
+            # The group was removed: stop handling right-clicks until it is created again
+            if not self.layer_manager.has_landtalk_group():
+                self.teardown_layer_tree_context_menu()
                 return
 
-            current_node = layer_tree_view.currentNode()
+            # Get the currently selected layer tree node
+            current_node = self._layer_tree_view.currentNode()
             if not current_node:
                 return
 
@@ -477,24 +578,21 @@ class LandTalkPlugin:
         try:
             # Prompt user for output file location
             # Generate default filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             group_name = group.name() if hasattr(group, 'name') else 'analysis'
-            safe_name = "".join(c for c in group_name if c.isalnum() or c in (' ', '-', '_')).strip()
-            default_filename = f"landtalk_{safe_name}_{timestamp}.gpkg"
+            default_filename = _default_export_filename(group_name)
 
             # Get project directory as default location
             project_dir = self.layer_manager.get_project_directory()
             if project_dir:
                 analysis_dir = os.path.join(project_dir, "LandTalk_Analysis")
-                if not os.path.exists(analysis_dir):
-                    os.makedirs(analysis_dir)
+                os.makedirs(analysis_dir, exist_ok=True)
                 default_path = os.path.join(analysis_dir, default_filename)
             else:
                 default_path = default_filename
 
             # Show save file dialog
             output_path, _ = QFileDialog.getSaveFileName(
-                self.iface.mainWindow(),
+                self.main_window,
                 "Export Layer Group to GeoPackage",
                 default_path,
                 "GeoPackage Files (*.gpkg);;All Files (*)"
@@ -513,14 +611,14 @@ class LandTalkPlugin:
 
             if result_path:
                 QMessageBox.information(
-                    self.iface.mainWindow(),
+                    self.main_window,
                     "Export Successful",
                     f"Layer group '{group.name()}' has been exported to:\n{result_path}"
                 )
                 logger.info(f"Successfully exported group to: {result_path}")
             else:
                 QMessageBox.warning(
-                    self.iface.mainWindow(),
+                    self.main_window,
                     "Export Failed",
                     f"Failed to export layer group '{group.name()}'"
                 )
@@ -528,7 +626,7 @@ class LandTalkPlugin:
         except Exception as e:
             logger.error(f"Error exporting group to GeoPackage: {str(e)}")
             QMessageBox.critical(
-                self.iface.mainWindow(),
+                self.main_window,
                 "Error",
                 f"An error occurred while exporting:\n{str(e)}"
             )
@@ -539,6 +637,7 @@ class LandTalkPlugin:
             self.config_manager.set_last_selected_model(model_data)
             logger.info(f"AI model selection changed to: {model_data}")
 
+    @pyqtSlot(str)
     def on_confidence_changed(self, text):
         """Handle confidence threshold input field changes"""
         try:
@@ -559,8 +658,18 @@ class LandTalkPlugin:
             # Invalid input, keep current value
             logger.warning(f"Invalid confidence threshold input: {text}")
     
+    @pyqtSlot(object)
     def on_rectangle_created(self, rectangle):
         """Handle rectangle selection on the map"""
+        # An accidental click yields a (nearly) empty rectangle: keep the selection
+        # tool active instead of rendering and encoding an empty map image
+        min_size = PluginConstants.MIN_SELECTION_SIZE_PX
+        if rectangle.width() < min_size or rectangle.height() < min_size:
+            logger.info("Ignoring selection smaller than the minimum size")
+            if self.dock_widget:
+                self.dock_widget.add_system_message("Selection too small, please drag a rectangle on the map.")
+            return
+
         # Capture the selected area as an image
         self.selected_rectangle = rectangle
         
@@ -569,24 +678,24 @@ class LandTalkPlugin:
             self.map_canvas.scene().removeItem(self.rubber_band)
         
         self.rubber_band = QgsRubberBand(self.map_canvas, QgsWkbTypes.GeometryType.LineGeometry)
-        self.rubber_band.setColor(QColor(255, 255, 255, 255))  # White color
+        self.rubber_band.setColor(_SELECTION_COLOR)
         self.rubber_band.setWidth(3)  # Slightly thicker for better visibility
-        self.rubber_band.setSecondaryStrokeColor(QColor(0, 0, 0, 255))  # Black outline
+        self.rubber_band.setSecondaryStrokeColor(_SELECTION_OUTLINE_COLOR)
         self.rubber_band.setLineStyle(Qt.PenStyle.SolidLine)
         
         # Convert screen coordinates to map coordinates using proper QGIS API
         mapToPixel = self.map_canvas.mapSettings().mapToPixel()
-        topLeft = mapToPixel.toMapCoordinates(QPoint(int(rectangle.topLeft().x()), int(rectangle.topLeft().y())))
-        topRight = mapToPixel.toMapCoordinates(QPoint(int(rectangle.topRight().x()), int(rectangle.topRight().y())))
-        bottomRight = mapToPixel.toMapCoordinates(QPoint(int(rectangle.bottomRight().x()), int(rectangle.bottomRight().y())))
-        bottomLeft = mapToPixel.toMapCoordinates(QPoint(int(rectangle.bottomLeft().x()), int(rectangle.bottomLeft().y())))
+        left, top = int(rectangle.left()), int(rectangle.top())
+        right, bottom = int(rectangle.right()), int(rectangle.bottom())
+        topLeft = mapToPixel.toMapCoordinates(left, top)
+        topRight = mapToPixel.toMapCoordinates(right, top)
+        bottomRight = mapToPixel.toMapCoordinates(right, bottom)
+        bottomLeft = mapToPixel.toMapCoordinates(left, bottom)
         
-        # Add the points to the rubber band
-        self.rubber_band.addPoint(topLeft)
-        self.rubber_band.addPoint(topRight)
-        self.rubber_band.addPoint(bottomRight)
-        self.rubber_band.addPoint(bottomLeft)
-        self.rubber_band.addPoint(topLeft)  # Close the polygon
+        # Set the closed outline on the rubber band in one call (a single redraw)
+        self.rubber_band.setToGeometry(
+            QgsGeometry.fromPolylineXY([topLeft, topRight, bottomRight, bottomLeft, topLeft])
+        )
      
         # Store a reference to the rectangle in the dock widget as well
         self.dock_widget.selected_rectangle = rectangle
@@ -636,6 +745,7 @@ class LandTalkPlugin:
         self.dock_widget.show()
         self.dock_widget.raise_()
 
+    @pyqtSlot()
     def on_selection_cancelled(self):
         """Handle cancelled rectangle selection (e.g., Escape key pressed)"""
         logger.info("Rectangle selection cancelled by user")
@@ -669,13 +779,17 @@ class LandTalkPlugin:
             existing_extent = self.capture_state.extent
             logger.info("Preserving existing map extent for resolution change")
 
-        # Reset stored coordinates
-        self.capture_state.clear()
-
         # Use the map renderer to capture the image
         # Pass existing_extent if we're preserving the map area (e.g., resolution change)
-        result = self.map_renderer.capture_map_image(self.selected_rectangle, existing_extent)
+        try:
+            result = self.map_renderer.capture_map_image(self.selected_rectangle, existing_extent)
+        except Exception:
+            # Never leave the previous image and extent behind for a later analysis
+            self.capture_state.clear()
+            raise
         if result[0] is None:  # encoded_image is None
+            # Reset stored coordinates (a successful capture replaces them all below)
+            self.capture_state.clear()
             return None
 
         # Unpack the result and store the captured data
@@ -739,18 +853,18 @@ class LandTalkPlugin:
         # Log cleanup
         logger.info("Selection rectangle removed")
 
-    def _create_query_extent_layer(self, ai_provider, model_name=None):
+    def _create_query_extent_layer(self, ai_provider, extent, width, height, model_name=None):
         """Create a layer with only the query extent bounding box"""
-        bbox_features_data = [{
-            'object_type': 'query_extent',
-            'probability': None,
-            'result_number': 0,
-            'box_2d': PluginConstants.DETECTION_COORD_RANGE,
-            'reason': ''
-        }]
+        from .json_processor import FeatureRecord
+        bbox_features_data = [FeatureRecord(
+            label='query_extent',
+            object_type='query_extent',
+            probability=None,
+            result_number=0,
+            reason='',
+            box_2d=tuple(PluginConstants.DETECTION_COORD_RANGE)
+        )]
 
-        # Unpack capture state for layer creation (only need extent, width, height)
-        extent, _, _, width, height, _ = self.capture_state.get_all()
         self.layer_manager.create_single_layer_with_features(
             bbox_features_data, ai_provider,
             extent, width, height,
@@ -767,23 +881,32 @@ class LandTalkPlugin:
         :param model_name: Full model name as shown in the model widget
         """
         logger.info(f"process_json_and_create_layers called with ai_provider: {ai_provider}")
-        logger.info(f"JSON data type: {type(my_json)}")
-        logger.info(f"JSON data: {my_json}")
-        logger.info(f"JSON data keys (if dict): {my_json.keys() if isinstance(my_json, dict) else 'Not a dict'}")
-        logger.info(f"JSON data length (if list): {len(my_json) if isinstance(my_json, list) else 'Not a list'}")
+        # The full document is only serialized when debug messages are actually logged
+        if logger.is_enabled_for(DEBUG):
+            from . import json_utils
+            logger.debug(f"JSON data ({type(my_json).__name__}): {json_utils.dumps_pretty(my_json)}")
 
         if not my_json:
             logger.info("No JSON data provided, returning")
             return
 
+        # The layers are placed on the captured extent, so there is nothing to do
+        # when the capture was cleared while the request was running
+        if not self.capture_state.has_capture():
+            logger.warning("Map capture was cleared before the AI response arrived, no layers created")
+            return
+
+        # Unpack capture state for layer creation (only need extent, width, height)
+        extent, _, _, width, height, _ = self.capture_state.get_all()
+
+        from .json_processor import AIResponseProcessor, ITEM_CONTAINER_KEYS
+        from .message_formatter import MessageFormatter
+
         try:
             # Use the JSON processor to extract features
             processor = AIResponseProcessor(self.config_manager.get_confidence_threshold())
             features_data, stats = processor.process_json_response(my_json)
 
-            # Unpack capture state for layer creation (only need extent, width, height)
-            extent, _, _, width, height, _ = self.capture_state.get_all()
-
             # Create a single layer with all features if we have any valid features
             if features_data:
                 self.layer_manager.create_single_layer_with_features(
@@ -803,7 +926,7 @@ class LandTalkPlugin:
                 )
             else:
                 # If no analysis results, still create a layer with just the bounding box
-                self._create_query_extent_layer(ai_provider, model_name)
+                self._create_query_extent_layer(ai_provider, extent, width, height, model_name)
 
                 # Create and display warning message
                 warning_msg = MessageFormatter.format_warning_message(
@@ -818,19 +941,15 @@ class LandTalkPlugin:
                 )
 
             # Debug: Render AI results as yellow rectangles on captured image
-            # Extract items for debug rendering
-            if isinstance(my_json, list):
-                items_to_process = my_json
-            elif isinstance(my_json, dict):
-                for key in ['objects', 'detections', 'features']:
-                    if key in my_json:
-                        items_to_process = my_json[key]
-                        break
+            if PluginConstants.DEBUG_RENDER:
+                # Extract items for debug rendering
+                if isinstance(my_json, list):
+                    items_to_process = my_json
+                elif isinstance(my_json, dict):
+                    items_to_process = next((my_json[key] for key in ITEM_CONTAINER_KEYS if key in my_json), [my_json])
                 else:
-                    items_to_process = [my_json]
-            else:
-                items_to_process = []
-            self.debug_render_ai_results_on_image(items_to_process, ai_provider)
+                    items_to_process = []
+                self.debug_render_ai_results_on_image(items_to_process, ai_provider)
 
         except Exception as e:
             logger.error(f"Error processing JSON data for layer creation: {str(e)}")
@@ -843,7 +962,7 @@ class LandTalkPlugin:
             ai_results: List of AI detection results with bounding box coordinates
             ai_provider: String indicating the AI provider ('gemini' or 'gpt')
         """
-        logger.info(f"Entering debug_render_ai_results_on_image with {len(ai_results) if ai_results else 0} AI results from {ai_provider}")
+        logger.debug(f"Entering debug_render_ai_results_on_image with {len(ai_results) if ai_results else 0} AI results from {ai_provider}")
         try:
             # Check if we have captured image data
             if not self.capture_state.has_capture():
@@ -851,35 +970,20 @@ class LandTalkPlugin:
                 return
             
             # Get the temp directory
-            import tempfile
             temp_dir = tempfile.gettempdir()
             
-            # Create a temporary file for the captured image
-            temp_image_path = os.path.join(temp_dir, "debug_captured_image.png")
-            
-            # Decode and save the base64 image data
-            import base64
-            with open(temp_image_path, "wb") as f:
-                f.write(base64.b64decode(self.capture_state.image_data))
-            
-            # Call the debug render function from MapRenderer
-            debug_path = self.map_renderer.debug_render_ai_results(ai_results, temp_image_path, temp_dir)
-            
-            if debug_path:
-                logger.info(f"Debug image created successfully: {debug_path}")
-            else:
-                logger.warning("Failed to create debug image")
-            
-            # Clean up temporary file
-            try:
-                os.remove(temp_image_path)
-            except Exception as e:
-                logger.debug("Failed to remove temporary image file: %s", e)
+            # Draw and save the image on a thread pool thread, so the UI is not blocked.
+            # The decoded bytes are read here, the capture state is not touched off-thread.
+            from qgis.PyQt.QtCore import QThreadPool
+            from .map_tools import DebugRenderTask
+            QThreadPool.globalInstance().start(DebugRenderTask(
+                self.map_renderer, ai_results, self.capture_state.image_bytes, temp_dir
+            ))
 
         except Exception as e:
             logger.error(f"Error in debug_render_ai_results_on_image: {str(e)}")
         finally:
-            logger.info("Exiting debug_render_ai_results_on_image")
+            logger.debug("Exiting debug_render_ai_results_on_image")
 
     # chat rules functions - delegated to config_manager
     def edit_system_prompt(self):
@@ -888,8 +992,10 @@ class LandTalkPlugin:
 
     def show_tutorial_dialog(self):
         """Show the tutorial dialog for first-time users"""
+        self._tutorial_shown = True
         try:
-            tutorial_dialog = TutorialDialog(self.iface.mainWindow())
+            from .tutorial_dialog import TutorialDialog
+            tutorial_dialog = TutorialDialog(self.main_window)
             result = tutorial_dialog.exec()
 
             # Check if user wants to show tutorial again
@@ -32,6 +32,7 @@ group management, and layer tracking.
 """
 
 import os
+import re
 import tempfile
 from datetime import datetime
 from qgis.PyQt.QtCore import QVariant
@@ -45,7 +46,11 @@ from qgis.core import (
     QgsCoordinateReferenceSystem, QgsCoordinateTransformContext,
     QgsSymbol, QgsFillSymbol, QgsLineSymbol, QgsMarkerSymbol
 )
-from .logging import logger
+from .logging import logger, DEBUG
+from .json_processor import FeatureRecord
+
+# Runs of whitespace and underscores in sanitized layer names
+_RE_NAME_SEPARATOR_RUNS = re.compile(r'[\s_]+')
 
 
 class LayerManager:
@@ -62,6 +67,8 @@ class LayerManager:
         self.plugin = plugin
         self.plugin_dir = plugin.plugin_dir
         self.layer_counter = 0
+        # Set once a memory layer was created in this session (checked on project save)
+        self.memory_layers_created = False
 
     @staticmethod
     def sanitize_layer_name(name):
@@ -93,8 +100,7 @@ class LayerManager:
             # Skip other special characters
         
         # Replace multiple consecutive spaces or underscores with single underscore
-        import re
-        sanitized = re.sub(r'[\s_]+', '_', sanitized)
+        sanitized = _RE_NAME_SEPARATOR_RUNS.sub('_', sanitized)
         
         # Remove leading/trailing underscores and spaces
         sanitized = sanitized.strip('_').strip()
@@ -135,19 +141,12 @@ class LayerManager:
             bool: True if node is within LandTalk.ai hierarchy
         """
         try:
-            if not node:
-                return False
-
-            # Check if this is the main LandTalk.ai group
-            if hasattr(node, 'name') and node.name() == self.GROUP_NAME:
-                return True
-
-            # Walk up the parent hierarchy
-            current_parent = node.parent() if hasattr(node, 'parent') else None
-            while current_parent:
-                if hasattr(current_parent, 'name') and current_parent.name() == self.GROUP_NAME:
+            # Walk up from the node itself (it may be the LandTalk.ai group) to the root,
+            # every layer tree node provides name() and parent()
+            while node is not None:
+                if node.name() == self.GROUP_NAME:
                     return True
-                current_parent = current_parent.parent() if hasattr(current_parent, 'parent') else None
+                node = node.parent()
 
             return False
 
@@ -179,28 +178,22 @@ class LayerManager:
     
     def collect_gpkg_files_from_group(self, group):
         """Collect all GPKG file paths from layers within a group"""
-        gpkg_files = []
+        # Insertion-ordered set of file paths
+        gpkg_files = {}
         try:
-            # Check layers in this group
+            # findLayers() already returns the layers of all nested subgroups
             for layer_tree_layer in group.findLayers():
                 layer = layer_tree_layer.layer()
                 if layer and layer.isValid():
                     source = layer.source()
                     if source.endswith('.gpkg'):
                         # Extract the file path (remove layer name if present)
-                        file_path = source.split('|')[0] if '|' in source else source
-                        if file_path not in gpkg_files:
-                            gpkg_files.append(file_path)
-            
-            # Recursively check subgroups
-            for child in group.children():
-                if isinstance(child, QgsLayerTreeGroup):
-                    gpkg_files.extend(self.collect_gpkg_files_from_group(child))
+                        gpkg_files[source.split('|', 1)[0]] = None
                     
         except Exception as e:
             logger.error(f"Error collecting GPKG files from group: {str(e)}")
         
-        return gpkg_files
+        return list(gpkg_files)
 
     def get_or_create_ai_analysis_group(self):
         """
@@ -220,7 +213,15 @@ class LayerManager:
         ai_analysis_group = root.insertGroup(0, self.GROUP_NAME)
         logger.info(f"Created new {self.GROUP_NAME} group")
 
+        # The export context menu is only needed once the project has the group
+        self.plugin.setup_layer_tree_context_menu()
+
         return ai_analysis_group
+
+    @classmethod
+    def has_landtalk_group(cls):
+        """Check if the current project contains the LandTalk.ai group (needs no instance)"""
+        return QgsProject.instance().layerTreeRoot().findGroup(cls.GROUP_NAME) is not None
     
     def update_ai_analysis_visibility(self, current_group_name=None):
         """
@@ -302,12 +303,12 @@ class LayerManager:
                 logger.error(f"Error creating GeoPackage: {writer.errorMessage()}")
                 return None
             
-            # Add features if provided
-            if features:
-                for feature in features:
-                    writer.addFeature(feature)
-            
-            del writer  # Ensure file is closed
+            try:
+                # Add features if provided, all in one call
+                if features and not writer.addFeatures(features):
+                    logger.warning(f"Not all features could be written to {file_path}: {writer.lastError()}")
+            finally:
+                del writer  # Ensure file is closed
             
             # Load the layer into QGIS
             layer = QgsVectorLayer(file_path, layer_name, "ogr")
@@ -349,7 +350,7 @@ class LayerManager:
         Create a group with individual memory vector layers for each feature.
         Supports both point and polygon (bounding box) geometries.
 
-        :param features_data: List of dictionaries with 'label', 'bbox'/'point', and 'reason' keys
+        :param features_data: List of FeatureRecord items or dictionaries with 'label', 'bbox'/'point', and 'reason' keys
         :param ai_provider: String indicating the AI provider ('gemini' or 'gpt')
         :param captured_map_extent: QgsRectangle of the captured area
         :param captured_extent_width: Width of extent in map units
@@ -360,10 +361,12 @@ class LayerManager:
         # Generate timestamp if not provided
         if response_timestamp is None:
             response_timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        logger.info(f"create_single_layer_with_features called with ai_provider: {ai_provider}")
-        logger.info(f"features_data: {features_data}")
-        logger.info(f"features_data type: {type(features_data)}")
-        logger.info(f"features_data length: {len(features_data) if isinstance(features_data, list) else 'Not a list'}")
+        logger.info(f"create_single_layer_with_features called with ai_provider: {ai_provider}, "
+                    f"{len(features_data) if features_data else 0} features")
+        # Per-feature messages are only formatted when they will actually be logged
+        log_features = logger.is_enabled_for(DEBUG)
+        if log_features:
+            logger.debug(f"features_data: {features_data}")
 
         if not features_data:
             logger.info("No features_data provided, returning early")
@@ -391,15 +394,28 @@ class LayerManager:
         # Disable all previous LandTalk.AI analysis groups, keeping only the current one enabled
         self.update_ai_analysis_visibility(current_group_name=group_name)
 
+        # Coordinate transform shared by all features of this response
+        coord_transform = self._normalized_to_map_transform(
+            captured_map_extent, captured_extent_width, captured_extent_height
+        )
+
         # Create individual layers for each feature
         created_layers = []
         collected_labels = []  # remember labels for this analysis group
 
         for i, feature_info in enumerate(features_data):
-            logger.info(f"Processing feature {i+1}: {feature_info}")
+            if log_features:
+                logger.debug(f"Processing feature {i+1}: {feature_info}")
 
             # Extract feature information
-            if isinstance(feature_info, dict):
+            if isinstance(feature_info, FeatureRecord):
+                # Records from AIResponseProcessor carry normalized fields
+                label = feature_info.label or f'Feature_{i+1}'
+                reason = feature_info.reason or 'No reason provided'
+                confidence = float(feature_info.probability or 50.0)
+                point_coords = feature_info.point or []
+                bbox_coords = feature_info.box_2d or []
+            elif isinstance(feature_info, dict):
                 # Extract label/object type (prioritize 'label' as it's the new format)
                 label = (self._get_field_case_insensitive(feature_info, 'label', 'object_type', 'object type') or
                         f'Feature_{i+1}')
@@ -433,10 +449,9 @@ class LayerManager:
 
                 # Create point layer if point coordinates exist
                 if point_coords and len(point_coords) >= 2:
-                    logger.info(f"Creating point geometry for feature {i+1}")
-                    map_point = self._convert_point_to_map_coordinates(
-                        point_coords, captured_map_extent, captured_extent_width, captured_extent_height
-                    )
+                    if log_features:
+                        logger.debug(f"Creating point geometry for feature {i+1}")
+                    map_point = self._convert_point_to_map_coordinates(point_coords, coord_transform)
                     if map_point:
                         point_geometry = self._create_point_from_coords(map_point)
                         if point_geometry:
@@ -444,10 +459,9 @@ class LayerManager:
 
                 # Create bbox layer if bounding box coordinates exist
                 if bbox_coords and len(bbox_coords) >= 4:
-                    logger.info(f"Creating polygon geometry for feature {i+1}")
-                    map_coords = self._convert_bbox_to_map_coordinates(
-                        bbox_coords, captured_map_extent, captured_extent_width, captured_extent_height
-                    )
+                    if log_features:
+                        logger.debug(f"Creating polygon geometry for feature {i+1}")
+                    map_coords = self._convert_bbox_to_map_coordinates(bbox_coords, coord_transform)
                     if map_coords:
                         bbox_geometry = self._create_polygon_from_coords(map_coords)
                         if bbox_geometry:
@@ -474,9 +488,7 @@ class LayerManager:
                     )
 
                     if layer:
-                        # Add layer to the analysis group
-                        project.addMapLayer(layer, False)
-                        analysis_group.addLayer(layer)
+                        # Registered with the project in one call after the loop
                         created_layers.append(layer)
 
                         # Only add label once even if multiple layers
@@ -487,7 +499,8 @@ class LayerManager:
                         self.configure_layer_style(layer)
                         self.configure_layer_labeling(layer)
 
-                        logger.info(f"Successfully created {geometry_type} layer: {layer_name}")
+                        if log_features:
+                            logger.debug(f"Successfully created {geometry_type} layer: {layer_name}")
                     else:
                         logger.warning(f"Failed to create layer for feature {i+1}")
 
@@ -495,6 +508,13 @@ class LayerManager:
                 logger.error(f"Error processing feature {i+1}: {str(e)}")
                 continue
 
+        # Add all layers at once, so the project emits a single layersAdded signal
+        # instead of one per layer, then attach them to the group in feature order
+        if created_layers:
+            project.addMapLayers(created_layers, False)
+            for layer in created_layers:
+                analysis_group.addLayer(layer)
+
         logger.info(f"Created {len(created_layers)} layers in group {group_name}")
         logger.info(f"Collected labels: {collected_labels}")
 
@@ -540,21 +560,34 @@ class LayerManager:
 
         return created_layers
     
-    def _convert_point_to_map_coordinates(self, point_coords, captured_map_extent, extent_width, extent_height):
+    @staticmethod
+    def _normalized_to_map_transform(captured_map_extent, extent_width, extent_height):
+        """Compute the transform from normalized 0-1000 coordinates to map coordinates
+
+        The extent is read and the scale factors are divided out once per response,
+        so converting a coordinate is a single multiply-add.
+
+        Returns: (x_origin, y_origin, x_scale, y_scale) where
+            map_x = x_origin + x * x_scale and map_y = y_origin - y * y_scale
+        """
+        return (
+            captured_map_extent.xMinimum(),
+            captured_map_extent.yMaximum(),
+            extent_width / 1000.0,
+            extent_height / 1000.0,
+        )
+
+    def _convert_point_to_map_coordinates(self, point_coords, coord_transform):
         """Convert relative point coordinates to map coordinates"""
         try:
             if len(point_coords) < 2:
                 return None
 
-            x, y = point_coords[:2]
+            x_origin, y_origin, x_scale, y_scale = coord_transform
 
-            # Convert from 0-1000 range to 0-1 range
-            x_norm = x / 1000.0
-            y_norm = y / 1000.0
-
-            # Convert to map coordinates
-            map_x = captured_map_extent.xMinimum() + (x_norm * extent_width)
-            map_y = captured_map_extent.yMaximum() - (y_norm * extent_height)
+            # Convert from the 0-1000 range to map coordinates (image Y points down)
+            map_x = x_origin + point_coords[0] * x_scale
+            map_y = y_origin - point_coords[1] * y_scale
 
             return [map_x, map_y]
 
@@ -562,7 +595,7 @@ class LayerManager:
             logger.error(f"Error converting point coordinates: {str(e)}")
             return None
 
-    def _convert_bbox_to_map_coordinates(self, bbox_coords, captured_map_extent, extent_width, extent_height):
+    def _convert_bbox_to_map_coordinates(self, bbox_coords, coord_transform):
         """Convert relative bounding box coordinates to map coordinates
 
         The AI returns bounding boxes in format: [ymin, xmin, ymax, xmax] where:
@@ -581,15 +614,10 @@ class LayerManager:
 
             # Extract coordinates from AI format [ymin, xmin, ymax, xmax]
             # Note: In image coords, ymin is the TOP, ymax is the BOTTOM
-            ymin_img, xmin_img, ymax_img, xmax_img = bbox_coords[:4]
-
-            # Convert from 0-1000 range to 0-1 normalized range
-            xmin_norm = xmin_img / 1000.0
-            ymin_norm = ymin_img / 1000.0
-            xmax_norm = xmax_img / 1000.0
-            ymax_norm = ymax_img / 1000.0
+            ymin_img, xmin_img, ymax_img, xmax_img = bbox_coords[0], bbox_coords[1], bbox_coords[2], bbox_coords[3]
+            x_origin, y_origin, x_scale, y_scale = coord_transform
 
-            # Convert to map coordinates
+            # Convert from the 0-1000 range to map coordinates
             # Map coordinate system: Y increases from south to north (yMin at bottom, yMax at top)
             # Image coordinate system: Y increases from top to bottom (0 at top, 1000 at bottom)
             #
@@ -598,16 +626,17 @@ class LayerManager:
             # - Image Y=1000 (bottom) → Map yMinimum (south/bottom)
             #
             # X coordinates: both systems increase left to right (no flip needed)
-            left = captured_map_extent.xMinimum() + (xmin_norm * extent_width)
-            right = captured_map_extent.xMinimum() + (xmax_norm * extent_width)
+            left = x_origin + xmin_img * x_scale
+            right = x_origin + xmax_img * x_scale
 
             # Y coordinates: need to flip because image Y increases downward, map Y increases upward
             # ymin_img (small value, top of image) → large map Y (near yMaximum)
             # ymax_img (large value, bottom of image) → small map Y (near yMinimum)
-            top_map = captured_map_extent.yMaximum() - (ymin_norm * extent_height)
-            bottom_map = captured_map_extent.yMaximum() - (ymax_norm * extent_height)
+            top_map = y_origin - ymin_img * y_scale
+            bottom_map = y_origin - ymax_img * y_scale
 
-            logger.info(f"Converted bbox: image[ymin={ymin_img},xmin={xmin_img},ymax={ymax_img},xmax={xmax_img}] → map[L={left:.2f},T={top_map:.2f},R={right:.2f},B={bottom_map:.2f}]")
+            if logger.is_enabled_for(DEBUG):
+                logger.debug(f"Converted bbox: image[ymin={ymin_img},xmin={xmin_img},ymax={ymax_img},xmax={xmax_img}] → map[L={left:.2f},T={top_map:.2f},R={right:.2f},B={bottom_map:.2f}]")
             return [left, top_map, right, bottom_map]
 
         except Exception as e:
@@ -665,6 +694,7 @@ class LayerManager:
             if not layer.isValid():
                 logger.error(f"Failed to create memory layer: {layer_name}")
                 return None
+            self.memory_layers_created = True
 
             # Add fields
             provider = layer.dataProvider()
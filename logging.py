@@ -35,6 +35,14 @@ import os
 import datetime
 from typing import Optional
 from qgis.core import QgsMessageLog, Qgis
+from .constants import PluginConstants
+
+# Log level thresholds, ordered by severity
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+CRITICAL = 50
 
 
 class Logging:
@@ -46,20 +54,45 @@ class Logging:
     also maintaining a persistent log file with timestamps.
     """
     
-    def __init__(self, plugin_name: str = "GeminiPlugin", log_file: str = "logging.txt"):
+    def __init__(self, plugin_name: str = "GeminiPlugin", log_file: str = "logging.txt", level: int = INFO):
         """
         Initialize the logging system.
         
         Args:
             plugin_name (str): Name of the plugin for QGIS logging
             log_file (str): Path to the log file (relative to plugin directory)
+            level (int): Minimum level of messages that are logged
         """
         self.plugin_name = plugin_name
         self.log_file = log_file
+        self.level = level
         self.log_file_path = None
         self._log_file_initialized = False
         # Defer file creation until first log message to avoid startup delays
     
+    def set_level(self, level: int):
+        """
+        Set the minimum level of messages that are logged.
+        
+        Args:
+            level (int): One of DEBUG, INFO, WARNING, ERROR, CRITICAL
+        """
+        self.level = level
+    
+    def is_enabled_for(self, level: int) -> bool:
+        """
+        Check whether messages of the given level would be logged.
+        
+        Use this to skip building expensive log messages that would be discarded.
+        
+        Args:
+            level (int): One of DEBUG, INFO, WARNING, ERROR, CRITICAL
+            
+        Returns:
+            bool: True if messages of this level are logged
+        """
+        return level >= self.level
+    
     def _ensure_log_file_exists(self):
         """Ensure the log file exists and is writable. Deletes existing log file upon initialization."""
         try:
@@ -122,6 +155,9 @@ class Logging:
             message (str): The message to log
             tag (str, optional): Additional tag for the message
         """
+        if DEBUG < self.level:
+            return
+        
         full_message = f"[DEBUG] {message}"
         if tag:
             full_message = f"[{tag}] {full_message}"
@@ -137,6 +173,9 @@ class Logging:
             message (str): The message to log
             tag (str, optional): Additional tag for the message
         """
+        if INFO < self.level:
+            return
+        
         full_message = f"[INFO] {message}"
         if tag:
             full_message = f"[{tag}] {full_message}"
@@ -152,6 +191,9 @@ class Logging:
             message (str): The message to log
             tag (str, optional): Additional tag for the message
         """
+        if WARNING < self.level:
+            return
+        
         full_message = f"[WARNING] {message}"
         if tag:
             full_message = f"[{tag}] {full_message}"
@@ -167,6 +209,9 @@ class Logging:
             message (str): The message to log
             tag (str, optional): Additional tag for the message
         """
+        if ERROR < self.level:
+            return
+        
         full_message = f"[ERROR] {message}"
         if tag:
             full_message = f"[{tag}] {full_message}"
@@ -182,6 +227,9 @@ class Logging:
             message (str): The message to log
             tag (str, optional): Additional tag for the message
         """
+        if CRITICAL < self.level:
+            return
+        
         full_message = f"[CRITICAL] {message}"
         if tag:
             full_message = f"[{tag}] {full_message}"
@@ -225,6 +273,6 @@ class Logging:
 
 
 # Create a default logger instance for the plugin
-logger = Logging()
+logger = Logging(level=DEBUG if PluginConstants.DEBUG_LOGGING else INFO)
 
 
@@ -18,10 +18,14 @@
  ***************************************************************************/
 """
 
+from .base64_utils import b64decode
+
 
 class MapCaptureState:
     """Manage state data for captured map images and extents"""
 
+    __slots__ = ('extent', 'top_left', 'bottom_right', 'width', 'height', '_image_data', '_image_bytes')
+
     def __init__(self):
         """Initialize empty capture state"""
         self.extent = None  # QgsRectangle of the captured area in map coordinates
@@ -29,7 +33,32 @@ class MapCaptureState:
         self.bottom_right = None  # Bottom-right corner in map coordinates (tuple)
         self.width = None  # Width of extent in map units
         self.height = None  # Height of extent in map units
-        self.image_data = None  # Base64 encoded image data for chat display
+        self._image_data = None  # Base64 encoded image data for chat display
+        self._image_bytes = None  # Decoded image data, filled on first use
+
+    @property
+    def image_data(self):
+        """Base64 encoded image data of the capture"""
+        return self._image_data
+
+    @image_data.setter
+    def image_data(self, image_data):
+        self._image_data = image_data
+        self._image_bytes = None
+
+    @property
+    def image_bytes(self):
+        """
+        Decoded image bytes of the capture.
+
+        The base64 data is decoded on first access and kept until the image changes.
+
+        Returns:
+            bytes: Encoded image file contents, or None if there is no capture
+        """
+        if self._image_bytes is None and self._image_data is not None:
+            self._image_bytes = b64decode(self._image_data)
+        return self._image_bytes
 
     def clear(self):
         """Reset all state to None"""
@@ -33,10 +33,9 @@ selection tools, and map image rendering.
 
 import os
 import tempfile
-import base64
 import time
-from qgis.PyQt.QtCore import Qt, QRectF, QSize, pyqtSignal, QPointF, QPoint, QBuffer, QIODevice
-from qgis.PyQt.QtGui import QColor, QPixmap, QPainter, QPen, QKeyEvent
+from qgis.PyQt.QtCore import Qt, QRectF, QSize, pyqtSignal, QPointF, QPoint, QBuffer, QIODevice, QRunnable
+from qgis.PyQt.QtGui import QColor, QImage, QPixmap, QPainter, QPen, QKeyEvent
 from qgis.PyQt.QtWidgets import QMessageBox
 from qgis.core import (
     Qgis, QgsProject, QgsMapSettings,
@@ -45,6 +44,7 @@ from qgis.core import (
 )
 from qgis.gui import QgsRubberBand, QgsMapTool
 from .logging import logger
+from .base64_utils import b64encode_str
 
 
 class RectangleMapTool(QgsMapTool):
@@ -419,7 +419,7 @@ class MapRenderer:
         buffer = QBuffer()
         buffer.open(QIODevice.OpenModeFlag.WriteOnly)
         rendered_image.save(buffer, "PNG")
-        encoded_image = base64.b64encode(buffer.data()).decode('utf-8')
+        encoded_image = b64encode_str(buffer.data())
         buffer.close()
 
         # Save to temp file for thumbnail use
@@ -473,30 +473,28 @@ class MapRenderer:
 
         return output_width, output_height
 
-    def debug_render_ai_results(self, ai_results, captured_image_path, plugin_directory):
+    def debug_render_ai_results(self, ai_results, image_bytes, plugin_directory):
         """Render AI detection results as yellow rectangles on the captured image for debugging.
 
+        Only QImage is used, so this can run on a worker thread (see DebugRenderTask).
+
         Args:
             ai_results: List of AI detection results with bounding box coordinates
-            captured_image_path: Path to the original captured image
+            image_bytes: Encoded (PNG) bytes of the captured image
             plugin_directory: Directory where to save the debug image
 
         Returns:
             str: Path to the debug image file, or None if failed
         """
         try:
-            # Load the captured image
-            if not os.path.exists(captured_image_path):
-                logger.error(f"Image not found: {captured_image_path}")
-                return None
-
-            pixmap = QPixmap(captured_image_path)
-            if pixmap.isNull():
-                logger.error(f"Failed to load image: {captured_image_path}")
+            # Load the captured image directly from memory
+            image = QImage()
+            if not image_bytes or not image.loadFromData(image_bytes):
+                logger.error("Failed to load captured image data")
                 return None
 
             # Draw rectangles on the image
-            painter = QPainter(pixmap)
+            painter = QPainter(image)
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             painter.setPen(QPen(QColor(255, 255, 0, 255), 3))  # Yellow, 3px
 
@@ -504,7 +502,7 @@ class MapRenderer:
             for i, result in enumerate(ai_results):
                 bbox_coords = self._extract_bbox_coordinates(result)
                 if bbox_coords:
-                    rect = self._bbox_to_qrect(bbox_coords, pixmap.width(), pixmap.height())
+                    rect = self._bbox_to_qrect(bbox_coords, image.width(), image.height())
                     painter.drawRect(rect)
                     rectangles_drawn += 1
                     logger.debug(f"Drew rectangle {rectangles_drawn}: {rect}")
@@ -515,7 +513,7 @@ class MapRenderer:
 
             # Save the debug image
             debug_path = os.path.join(plugin_directory, "debug_ai_results.png")
-            if pixmap.save(debug_path, "PNG"):
+            if image.save(debug_path, "PNG"):
                 logger.info(f"Debug image saved: {debug_path} ({rectangles_drawn} rectangles)")
                 return debug_path
             else:
@@ -540,7 +538,7 @@ class MapRenderer:
             if field in result:
                 bbox = result[field]
                 if isinstance(bbox, list) and len(bbox) >= 4:
-                    return tuple(bbox[:4])
+                    return (bbox[0], bbox[1], bbox[2], bbox[3])
 
         # Try x, y, width, height format
         if all(k in result for k in ['x', 'y', 'width', 'height']):
@@ -560,3 +558,32 @@ class MapRenderer:
         right = max(xmin, xmax) / 1000.0 * image_width
         bottom = max(ymin, ymax) / 1000.0 * image_height
         return QRectF(left, top, right - left, bottom - top)
+
+
+class DebugRenderTask(QRunnable):
+    """Thread pool task that renders the AI debug image off the UI thread"""
+
+    def __init__(self, map_renderer, ai_results, image_bytes, output_directory):
+        """Initialize the task
+
+        Args:
+            map_renderer: MapRenderer performing the rendering
+            ai_results: List of AI detection results with bounding box coordinates
+            image_bytes: Encoded (PNG) bytes of the captured image
+            output_directory: Directory where to save the debug image
+        """
+        super().__init__()
+        self.map_renderer = map_renderer
+        self.ai_results = ai_results
+        self.image_bytes = image_bytes
+        self.output_directory = output_directory
+
+    def run(self):
+        """Render and save the debug image"""
+        debug_path = self.map_renderer.debug_render_ai_results(
+            self.ai_results, self.image_bytes, self.output_directory
+        )
+        if debug_path:
+            logger.info(f"Debug image created successfully: {debug_path}")
+        else:
+            logger.warning("Failed to create debug image")
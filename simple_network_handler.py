@@ -4,35 +4,125 @@ Simple network handler using the requests library.
 Much simpler than QgsBlockingNetworkRequest and respects system proxy settings.
 """
 
-import json
+import socket
+import threading
+import weakref
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from typing import Dict, Any, Optional, Union
 from .logging import logger
+from . import json_utils
+
+
+class _AbortableHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that keeps track of the connections it opens.
+    
+    Closing the adapter only closes idle pooled connections, while a request in
+    flight keeps its socket until it completes or times out. Tracking the
+    connections lets another thread shut down their sockets, which makes the
+    blocked request fail right away with a connection error.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        # Needed by init_poolmanager(), which the base class calls from __init__
+        self._pool_classes = {
+            'http': self._tracking_pool_class(HTTPConnectionPool),
+            'https': self._tracking_pool_class(HTTPSConnectionPool),
+        }
+        super().__init__(*args, **kwargs)
+    
+    def _tracking_pool_class(self, pool_class):
+        """Derive a connection pool class whose connections register with this adapter."""
+        adapter = self
+        
+        class TrackingConnection(pool_class.ConnectionCls):
+            def connect(self):
+                with adapter._connections_lock:
+                    adapter._connections.add(self)
+                super().connect()
+        
+        return type(pool_class.__name__, (pool_class,), {'ConnectionCls': TrackingConnection})
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self._pool_classes
+    
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        # SOCKS proxies bring their own pool classes, those connections are not tracked
+        if not proxy.lower().startswith('socks'):
+            manager.pool_classes_by_scheme = self._pool_classes
+        return manager
+    
+    def abort_connections(self):
+        """Shut down the sockets of all open connections, including those of requests in flight."""
+        with self._connections_lock:
+            connections = list(self._connections)
+        for connection in connections:
+            sock = getattr(connection, 'sock', None)
+            if not isinstance(sock, socket.socket):
+                continue
+            try:
+                # Shut down the raw socket: SSLSocket.shutdown would also reset the TLS
+                # state that the thread blocked in the request is still using
+                socket.socket.shutdown(sock, socket.SHUT_RDWR)
+            except OSError:
+                pass
 
 
 class SimpleNetworkHandler:
     """
     Simple network handler using requests library.
     Automatically respects system proxy settings and is much easier to use.
+    
+    Requests go through a persistent session so that connections to the same
+    API host are kept alive and reused, avoiding a new TCP/TLS handshake on
+    every follow-up request. Keep one handler per plugin session instead of
+    creating a new one per call. abort_requests() cancels requests in flight
+    from another thread; the pooled connections stay open until close() is called.
     """
     
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, pool_connections: int = 3, pool_maxsize: int = 8):
         """
         Initialize the network handler.
         
         Args:
             timeout: Request timeout in seconds
+            pool_connections: Number of hosts to keep connection pools for
+            pool_maxsize: Maximum number of keep-alive connections per host
         """
         self.timeout = timeout
+        self.session = requests.Session()
+        self._adapter = _AbortableHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', self._adapter)
+        self.session.mount('http://', self._adapter)
+        
+    def close(self):
+        """Close all pooled connections of the underlying session."""
+        self.session.close()
+        
+    def abort_requests(self):
+        """
+        Cancel the requests in flight by shutting down their connections.
+        
+        Safe to call from any thread. The cancelled post_json calls return a
+        connection error result. Idle keep-alive connections are shut down too
+        and are replaced by new ones on the next request.
+        """
+        self._adapter.abort_connections()
         
-    def post_json(self, url: str, headers: Dict[str, str], data: Dict[str, Any]) -> Dict[str, Any]:
+    def post_json(self, url: str, headers: Dict[str, str], data: Union[Dict[str, Any], bytes]) -> Dict[str, Any]:
         """
         Perform a POST request with JSON data.
         
         Args:
             url: The URL to send the request to
             headers: HTTP headers to include
-            data: JSON data to send in the request body
+            data: JSON data to send in the request body, or the already encoded body
             
         Returns:
             Dictionary containing response data and metadata
@@ -41,10 +131,10 @@ class SimpleNetworkHandler:
             logger.info(f"Making request to: {url}")
             
             # Make the request - requests automatically handles proxy settings
-            response = requests.post(
+            response = self.session.post(
                 url=url,
-                headers=headers,
-                json=data,  # requests automatically handles JSON encoding
+                headers=self._json_headers(headers),
+                data=self._json_body(data),
                 timeout=self.timeout
             )
             
@@ -55,7 +145,7 @@ class SimpleNetworkHandler:
             
             return {
                 'success': True,
-                'data': response.json(),
+                'data': json_utils.loads(response.content),
                 'status_code': response.status_code,
                 'headers': dict(response.headers)
             }
@@ -104,7 +194,7 @@ class SimpleNetworkHandler:
                 'status_code': None
             }
             
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             error_msg = f"Invalid JSON response: {str(e)}"
             logger.error(error_msg)
             logger.error(f"Full request - URL: {url}")
@@ -114,6 +204,16 @@ class SimpleNetworkHandler:
                 'status_code': response.status_code,
                 'raw_content': response.text
             }
+    
+    @staticmethod
+    def _json_headers(headers: Dict[str, str]) -> Dict[str, str]:
+        """Add the JSON content type to the request headers unless already set."""
+        return {'Content-Type': 'application/json', **headers}
+    
+    @staticmethod
+    def _json_body(data: Union[Dict[str, Any], bytes]) -> bytes:
+        """Encode the request body as UTF-8 JSON unless it is already encoded."""
+        return data if isinstance(data, bytes) else json_utils.dumps_bytes(data)
 
 
 class NetworkError(Exception):
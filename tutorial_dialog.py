@@ -85,10 +85,12 @@ class TutorialDialog(QDialog):
         self.tab_widget = QTabWidget()
         layout.addWidget(self.tab_widget)
         
-        # Create tutorial sections
+        # Create tutorial sections (text of tabs other than the first is added when first shown)
+        self._deferred_tab_contents = {}
         self.create_getting_started_tab()
         self.create_tips_tricks_tab()
         self.create_faq_tab()
+        self.tab_widget.currentChanged.connect(self.load_deferred_tab_content)
         
         # Add bottom buttons
         self.create_bottom_buttons(layout)
@@ -217,7 +219,7 @@ class TutorialDialog(QDialog):
         content_layout.setContentsMargins(10, 10, 10, 10)
         
         # Single combined text content
-        combined_content = GETTING_STARTED_CONTENT
+        combined_content = load_tutorial_content(GETTING_STARTED_CONTENT_FILE)
         
         self.add_text_content(content_layout, combined_content)
         
@@ -242,10 +244,8 @@ class TutorialDialog(QDialog):
         content_layout = QVBoxLayout(content_widget)
         content_layout.setContentsMargins(10, 10, 10, 10)
         
-        # Single combined text content
-        combined_content = TIPS_TRICKS_CONTENT
-        
-        self.add_text_content(content_layout, combined_content)
+        # Single combined text content, loaded and added when the tab is first shown
+        self._deferred_tab_contents[self.tab_widget.count()] = (content_layout, TIPS_TRICKS_CONTENT_FILE)
         
         scroll_area.setWidget(content_widget)
         layout.addWidget(scroll_area)
@@ -268,16 +268,21 @@ class TutorialDialog(QDialog):
         content_layout = QVBoxLayout(content_widget)
         content_layout.setContentsMargins(10, 10, 10, 10)
         
-        # Single combined text content
-        combined_content = FAQ_CONTENT
-        
-        self.add_text_content(content_layout, combined_content)
+        # Single combined text content, loaded and added when the tab is first shown
+        self._deferred_tab_contents[self.tab_widget.count()] = (content_layout, FAQ_CONTENT_FILE)
         
         scroll_area.setWidget(content_widget)
         layout.addWidget(scroll_area)
         
         self.tab_widget.addTab(tab_widget, TAB_FAQ)
     
+    def load_deferred_tab_content(self, index):
+        """Add the text content of a tab the first time it is shown"""
+        deferred = self._deferred_tab_contents.pop(index, None)
+        if deferred:
+            content_layout, content_file = deferred
+            self.add_text_content(content_layout, load_tutorial_content(content_file))
+    
     
     def add_text_content(self, layout, text):
         """Add formatted text content with clickable links"""